@@ -1,8 +1,15 @@
+import importlib
 import streamlit as st
-from section1_transformation_by_matrix import run_transformation_by_matrix
-from section2_symmetry_rotation import run_symmetry_rotation
-from section3_complex_plane import run_complex_plane
-from section4_rotation_translation import run_rotation_translation
+
+# ✅ 메뉴 → (모듈, 실행 함수)
+#    섹션 모듈과 그 무거운 의존성(plotly, 식 컴파일러, 클릭 이벤트 컴포넌트 등)은
+#    그 메뉴를 처음 고를 때만 불러온다 (이후에는 sys.modules에 남아 있어 바로 사용)
+SECTIONS = {
+    "1. 행렬을 통한 일차변환": ("section1_transformation_by_matrix", "run_transformation_by_matrix"),
+    "2. 행렬을 통한 대칭/회전변환": ("section2_symmetry_rotation", "run_symmetry_rotation"),
+    "3. 복소평면에서의 이동": ("section3_complex_plane", "run_complex_plane"),
+    "4. 복소평면에서의 회전/평행이동": ("section4_rotation_translation", "run_rotation_translation"),
+}
 
 # ✅ 페이지 설정
 st.set_page_config(
@@ -15,19 +22,8 @@ st.set_page_config(
 st.title("🔄 도형 변환 실험실")
 
 # ✅ 사이드바 메뉴
-menu = st.sidebar.radio("📂 실험을 선택하세요", [
-    "1. 행렬을 통한 일차변환",
-    "2. 행렬을 통한 대칭/회전변환",
-    "3. 복소평면에서의 이동",
-    "4. 복소평면에서의 회전/평행이동"
-])
+menu = st.sidebar.radio("📂 실험을 선택하세요", list(SECTIONS))
 
 # ✅ 선택에 따라 해당 시뮬레이터 실행
-if menu == "1. 행렬을 통한 일차변환":
-    run_transformation_by_matrix()
-elif menu == "2. 행렬을 통한 대칭/회전변환":
-    run_symmetry_rotation()
-elif menu == "3. 복소평면에서의 이동":
-    run_complex_plane()
-elif menu == "4. 복소평면에서의 회전/평행이동":
-    run_rotation_translation()
+module_name, function_name = SECTIONS[menu]
+getattr(importlib.import_module(module_name), function_name)()
@@ -0,0 +1,65 @@
+// ✅ dash_symmetry_tool의 대칭 계산을 브라우저에서 (get_symmetry_matrix, get_line_coordinates와 같은 식)
+//    슬라이더를 끌거나 점 원을 옮길 때 서버를 거치지 않고 바뀐 trace 데이터만 Patch로 고친다.
+//    trace 순서: 0 원래 점, 1 변환된 점, 2 첫 번째 축, 3 두 번째 축, 4 연결선
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    symmetry: {
+        LINE_EXTENT: 6,
+
+        symmetryMatrix: function (axis, angle) {
+            if (axis === "x축") return [[1, 0], [0, -1]];
+            if (axis === "y축") return [[-1, 0], [0, 1]];
+            if (axis === "y=ax" && angle !== null && angle !== undefined) {
+                const t = 2 * angle * Math.PI / 180;
+                return [[Math.cos(t), Math.sin(t)], [Math.sin(t), -Math.cos(t)]];
+            }
+            return [[1, 0], [0, 1]];
+        },
+
+        lineCoordinates: function (axis, angle) {
+            const e = window.dash_clientside.symmetry.LINE_EXTENT;
+            if (axis === "y축") return [[0, 0], [-e, e]];
+            if (axis === "y=ax" && angle !== null && angle !== undefined) {
+                const a = Math.tan(angle * Math.PI / 180);
+                return [[-e, e], [-a * e, a * e]];
+            }
+            return [[-e, e], [0, 0]];
+        },
+
+        apply: function (m, p) {
+            return [m[0][0] * p[0] + m[0][1] * p[1], m[1][0] * p[0] + m[1][1] * p[1]];
+        },
+
+        // point_from_relayout과 같음: 점 원(shapes[0])을 끌어 놓았을 때만 새 중심, 아니면 no_update
+        pointFromRelayout: function (relayoutData, point) {
+            const keys = ["shapes[0].x0", "shapes[0].x1", "shapes[0].y0", "shapes[0].y1"];
+            if (!relayoutData || !keys.some(function (key) { return key in relayoutData; })) {
+                return window.dash_clientside.no_update;
+            }
+            const v = keys.map(function (key) { return relayoutData[key]; });
+            const x = v[0] !== undefined && v[1] !== undefined ? (v[0] + v[1]) / 2 : point[0];
+            const y = v[2] !== undefined && v[3] !== undefined ? (v[2] + v[3]) / 2 : point[1];
+            if (x === point[0] && y === point[1]) return window.dash_clientside.no_update;
+            return [x, y];
+        },
+
+        // figure_patch와 같음: 점만 옮겼으면 축 직선은 그대로 두고 점과 연결선만 고침
+        updateFigure: function (axis1, angle1, axis2, angle2, point) {
+            const s = window.dash_clientside.symmetry;
+            const first = s.apply(s.symmetryMatrix(axis1, angle1), point);
+            const moved = s.apply(s.symmetryMatrix(axis2, angle2), first);
+            const context = window.dash_clientside.callback_context || {};
+            const patch = new window.dash_clientside.Patch()
+                .assign(["data", 0, "x"], [point[0]]).assign(["data", 0, "y"], [point[1]])
+                .assign(["data", 1, "x"], [moved[0]]).assign(["data", 1, "y"], [moved[1]])
+                .assign(["data", 4, "x"], [point[0], first[0], moved[0]])
+                .assign(["data", 4, "y"], [point[1], first[1], moved[1]]);
+            if (context.triggered_id === "point") return patch.build();
+            const line1 = s.lineCoordinates(axis1, angle1);
+            const line2 = s.lineCoordinates(axis2, angle2);
+            return patch
+                .assign(["data", 2, "x"], line1[0]).assign(["data", 2, "y"], line1[1])
+                .assign(["data", 3, "x"], line2[0]).assign(["data", 3, "y"], line2[1])
+                .build();
+        }
+    }
+});
@@ -0,0 +1,124 @@
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+# ✅ 콜드 스타트 측정 (새 인스턴스가 처음 뜰 때 학생이 기다리는 시간)
+#    매 측정마다 새 파이썬 프로세스를 띄워 모듈 캐시·디스크 캐시 외에는 아무것도 재사용하지 않는다.
+#
+#    1) 모듈별 import 시간 — 앱이 처음 화면을 그릴 때 필요한 것과 메뉴를 고를 때 필요한 것
+#    2) 첫 화면까지 시간 — 새 프로세스에서 AppTest로 app.py를 한 번 실행 (import + 스크립트 실행)
+#    3) (--server) 실제 `streamlit run` 서버가 /_stcore/health에 응답할 때까지 시간
+#
+#    python benchmarks/cold_start.py [--repeat 5] [--server]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "streamlit",
+    "numpy",
+    "plotly.graph_objects",
+    "matplotlib.pyplot",
+    "section1_transformation_by_matrix",
+    "section2_symmetry_rotation",
+    "section3_complex_plane",
+    "section4_rotation_translation",
+]
+
+IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+import streamlit
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+FIRST_RENDER_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120).run()
+assert not at.exception, at.exception
+print(time.perf_counter() - start)
+"""
+
+
+def run_python(code):
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+# ✅ streamlit 자체는 이미 불러온 상태에서 (앱 스크립트가 실행되는 상황과 같게) 모듈 하나를 import
+def import_time(module, repeat):
+    if module == "streamlit":
+        code = IMPORT_SNIPPET.replace("import streamlit\n", "")
+    else:
+        code = IMPORT_SNIPPET
+    return [run_python(code.format(root=ROOT, module=module)) for _ in range(repeat)]
+
+
+def first_render_time(repeat):
+    code = FIRST_RENDER_SNIPPET.format(root=ROOT, app=os.path.join(ROOT, "app.py"))
+    return [run_python(code) for _ in range(repeat)]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# ✅ 서버 프로세스 시작부터 health 응답까지
+def server_ready_time(repeat, timeout=60):
+    times = []
+    for _ in range(repeat):
+        port = free_port()
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+             "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while time.perf_counter() - start < timeout:
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                        if r.status == 200:
+                            times.append(time.perf_counter() - start)
+                            break
+                except OSError:
+                    time.sleep(0.05)
+        finally:
+            proc.terminate()
+            proc.wait()
+    return times
+
+
+def report(name, samples):
+    ms = [s * 1e3 for s in samples]
+    print(f"{name:<40}{statistics.median(ms):>10.1f} ms  (min {min(ms):.1f}, max {max(ms):.1f})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--server", action="store_true", help="streamlit run 서버 준비 시간도 측정")
+    args = parser.parse_args()
+
+    print(f"python {sys.version.split()[0]}, 측정 {args.repeat}회 중앙값")
+    print("[import 시간 — streamlit을 불러온 뒤 추가로 드는 시간]")
+    for module in MODULES:
+        report(module, import_time(module, args.repeat))
+    print("[첫 화면]")
+    report("app.py 첫 실행 (새 프로세스, AppTest)", first_render_time(args.repeat))
+    if args.server:
+        report("streamlit run → /_stcore/health", server_ready_time(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+# ✅ dash_symmetry_tool 부하 시험 (serve_dash.py로 띄운 gunicorn 서버에 동시 접속)
+#    학생 한 명 = 연결 하나: 축·각도 슬라이더를 바꾸고 점을 끌어 놓는 콜백 요청을 쉬지 않고 보냄
+#    (가끔 페이지를 새로 여는 /_dash-layout 요청도 섞음)
+#    워커 수마다 서버를 새로 띄워 처리량(req/s)과 응답 시간 p50/p95/p99를 잼
+#
+#    브라우저 계산(SYMMETRY_CLIENTSIDE=1, 기본)에서는 이 콜백들이 서버에 오지 않으므로,
+#    서버가 모든 계산을 맡는 가장 나쁜 경우(SYMMETRY_CLIENTSIDE=0)로 잰다.
+#
+#    python benchmarks/dash_load_test.py [--clients 300] [--duration 10] [--workers 1 4]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+AXES = ["x축", "y축", "y=ax"]
+LAYOUT_EVERY = 50           # 요청 50번에 한 번은 페이지 새로 열기
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def figure_request(rng):
+    # 슬라이더는 1도 단위라 자주 나오는 조합이 겹침 (시험 문제의 각도 근처에 몰림)
+    axis1, axis2 = rng.choice(AXES), rng.choice(AXES)
+    angle1, angle2 = int(rng.gauss(30, 20)), int(rng.gauss(-30, 20))
+    point = [round(rng.uniform(-5, 5), 2), round(rng.uniform(-5, 5), 2)]
+    changed = rng.choice(["axis1.value", "angle1.value", "axis2.value", "angle2.value", "point.data"])
+    return {
+        "output": "graph.figure",
+        "outputs": {"id": "graph", "property": "figure"},
+        "inputs": [
+            {"id": "axis1", "property": "value", "value": axis1},
+            {"id": "angle1", "property": "value", "value": angle1},
+            {"id": "axis2", "property": "value", "value": axis2},
+            {"id": "angle2", "property": "value", "value": angle2},
+            {"id": "point", "property": "data", "value": point},
+        ],
+        "changedPropIds": [changed],
+        "state": [],
+    }
+
+
+# ✅ 연결 하나(학생 한 명)가 끝날 때까지 요청을 보내고 응답 시간(초)을 모음
+def student(port, deadline, seed, latencies, errors):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    count = 0
+    while time.perf_counter() < deadline:
+        count += 1
+        start = time.perf_counter()
+        try:
+            if count % LAYOUT_EVERY == 0:
+                conn.request("GET", "/_dash-layout")
+            else:
+                body = json.dumps(figure_request(rng))
+                conn.request("POST", "/_dash-update-component", body=body,
+                             headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+# ✅ 클라이언트 프로세스 하나가 여러 학생(스레드)을 맡음 — 클라이언트 쪽 GIL이 병목이 되지 않게 나눔
+def client_process(args):
+    port, students, duration, seed = args
+    deadline = time.perf_counter() + duration
+    latencies, errors = [], []
+    threads = [threading.Thread(target=student, args=(port, deadline, seed * 10_000 + i, latencies, errors))
+               for i in range(students)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors
+
+
+def wait_ready(port, proc, timeout=60):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if proc.poll() is not None:
+            raise RuntimeError("serve_dash.py가 시작하지 못했습니다")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/_dash-layout")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("서버 준비 시간 초과")
+
+
+def run_case(workers, args):
+    port = free_port()
+    env = dict(os.environ, DASH_BIND=f"127.0.0.1:{port}", DASH_WORKERS=str(workers),
+               DASH_THREADS=str(args.threads), SYMMETRY_CLIENTSIDE="0")
+    proc = subprocess.Popen([sys.executable, "serve_dash.py"], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port, proc)
+        procs = max(1, min(args.client_procs, args.clients))
+        shares = [args.clients // procs + (i < args.clients % procs) for i in range(procs)]
+        with multiprocessing.Pool(procs) as pool:
+            results = pool.map(client_process, [(port, n, args.duration, i) for i, n in enumerate(shares)])
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    latencies = np.array([t for lat, _ in results for t in lat]) * 1e3
+    errors = sum(len(err) for _, err in results)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies.size else (np.nan,) * 3
+    print(f"{workers:>7} {latencies.size / args.duration:>10.0f} "
+          f"{p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {errors:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=300, help="동시 접속 학생 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="조합마다 측정 시간 (초)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, multiprocessing.cpu_count()])
+    parser.add_argument("--threads", type=int, default=4, help="워커마다 스레드 수")
+    parser.add_argument("--client-procs", type=int, default=max(1, multiprocessing.cpu_count() // 2),
+                        help="요청을 보내는 클라이언트 프로세스 수")
+    args = parser.parse_args()
+
+    print(f"학생 {args.clients}명, 조합마다 {args.duration:.0f}초, CPU {multiprocessing.cpu_count()}개")
+    print(f"{'workers':>7} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for workers in args.workers:
+        run_case(workers, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.io as pio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from font_registry import plotly_font_family
+from section1_transformation_by_matrix import figure_skeleton, plot_shape
+from transform_core import circle_conic, transform_conic, transform_line, transform_shape
+
+# ✅ 섹션 1 재실행 한 번에 드는 그림 시간 비교
+#    "매번 새로 만들기" = 뼈대 캐시를 비우고 plot_shape (trace·layout 생성과 Plotly 검증 포함)
+#    "뼈대 재사용"     = 캐시된 뼈대에 배열과 축 범위만 끼움
+#    두 경우 모두 Streamlit이 하는 직렬화(to_dict + to_json)까지 포함해서도 잰다.
+#
+#    python benchmarks/plot_shape_timing.py [반복 횟수]
+
+REPEAT = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+MATRIX = np.array([[1.0, -1.0], [1.0, 2.0]])
+
+
+def cases():
+    triangle = np.array([[1, 1], [1, 2], [2, 1], [1, 1]], dtype=float)
+    square = np.array([[1, 1], [1, 2], [2, 2], [2, 1], [1, 1]], dtype=float)
+    circle = circle_conic([1, 1], 2.0)
+    line = (1.0, 1.0, 2.0)
+    return [
+        ("삼각형", triangle, transform_shape(triangle, MATRIX)),
+        ("사각형", square, transform_shape(square, MATRIX)),
+        ("원", circle, transform_conic(*circle, MATRIX)),
+        ("직선", line, transform_line(*line, MATRIX)),
+    ]
+
+
+def per_call_ms(func):
+    func()
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    return (time.perf_counter() - start) / REPEAT * 1e3
+
+
+def main():
+    print(f"{'도형':<6}{'새로 만들기':>12}{'뼈대 재사용':>12}{'+직렬화(새로)':>16}{'+직렬화(재사용)':>16}")
+    for shape_type, shape, transformed in cases():
+        def fresh():
+            figure_skeleton.cache_clear()
+            return plot_shape(shape_type, shape, transformed, MATRIX, plotly_font_family())
+
+        def cached():
+            return plot_shape(shape_type, shape, transformed, MATRIX, plotly_font_family())
+
+        def serialized(build):
+            return lambda: pio.to_json(build().to_dict(), validate=False)
+
+        row = [per_call_ms(fresh), per_call_ms(cached), per_call_ms(serialized(fresh)), per_call_ms(serialized(cached))]
+        print(f"{shape_type:<6}" + "".join(f"{ms:>12.2f}ms" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from functools import partial
+from unittest import mock
+
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.runtime.scriptrunner import RerunData
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# ✅ 섹션 2 클릭 → 화면 갱신 시간 (지금 방식과 예전 방식을 둘 다 실제로 실행해서 비교)
+#    지금: plotly_events 값(key="point_click")을 넣고 실행 → apply_click이 같은 실행 안에서 반영
+#    예전: 지금 패널에 예전 클릭 처리(아래 old_apply_click, old_plotly_events)를 끼워 실행 —
+#          key 없는 컴포넌트의 위젯 id에 클릭 값을 넣으면, 클릭을 받은 실행이 selected_point를 바꾸고
+#          st.rerun(scope="fragment")으로 한 번 더 그림
+#    브라우저에서처럼 클릭은 fragment만 다시 실행하는 요청으로 보낸다 (AppTest.run은 늘 스크립트 전체를 실행하고,
+#    예전 코드의 st.rerun(scope="fragment")는 fragment 재실행 안에서만 동작하므로).
+#    클릭마다 걸린 시간과 함께, 클릭 한 번에 패널이 몇 번 그려졌는지도 센다
+#    (패널 한 번에 reflection_matrix를 부르는 횟수로 나눠서 계산).
+#
+#    streamlit 1.66.0 기준 — 공개 API에 없는 AppTest 내부(_run, _tree, _fragment_storage)와
+#    local_script_runner.RerunData를 쓰므로 다른 버전에서는 고쳐야 할 수 있음
+#
+#    python benchmarks/section2_click_latency.py [--clicks 50]
+
+MAX_PASSES = 20                # 클릭 한 번에 패널을 이보다 많이 그리면 끊고 "멈추지 않음"으로 보고
+SHOWN_COMPONENT = {}           # AppTest마다 마지막으로 그려진 plotly_events 컴포넌트 id
+
+
+def section2_app(old):
+    import numpy as np
+    import streamlit as st
+    from streamlit_plotly_events import plotly_events
+    import section2_symmetry_rotation as section2
+
+    # ✅ 단일 실행 처리 전(3ec2bff 이전)의 클릭 처리
+    #    입력칸은 value=2.0 / 1.0 기본값만 두고 클릭을 반영하지 않았고, 그림은 key 없이 띄운 뒤
+    #    클릭이 오면 selected_point만 바꾸고 fragment를 다시 실행했다
+    def old_apply_click():
+        st.session_state.setdefault("input_x", 2.0)
+        st.session_state.setdefault("input_y", 1.0)
+
+    def old_plotly_events(fig, click_event, override_height, key=None):
+        result = plotly_events(fig, click_event=click_event, override_height=override_height)
+        if result:
+            st.session_state.selected_point = np.array([result[0]['x'], result[0]['y']])
+            st.rerun(scope="fragment")
+
+    if not hasattr(section2, "_calls"):
+        # 패널이 그려질 때마다 늘어나는 계수기 (fragment만 다시 실행돼도 셈)
+        # 계수가 _limit을 넘으면 실행을 멈춤 — 클릭 뒤 st.rerun()이 끝나지 않고 되풀이될 때를 위한 상한
+        section2._calls = [0]
+        section2._limit = [None]
+        section2._current = (section2.apply_click, section2.plotly_events)
+        original = section2.reflection_matrix
+
+        def counted(*args, **kwargs):
+            section2._calls[0] += 1
+            if section2._limit[0] is not None and section2._calls[0] > section2._limit[0]:
+                st.stop()
+            return original(*args, **kwargs)
+        section2.reflection_matrix = counted
+    section2.apply_click, section2.plotly_events = (old_apply_click, old_plotly_events) if old else section2._current
+    section2.run_symmetry_rotation()
+
+
+def counter():
+    import section2_symmetry_rotation as section2
+    return section2
+
+
+def click_points(count):
+    return [(round(-4 + 8 * k / count, 3), round(4 - 8 * k / count, 3)) for k in range(count)]
+
+
+# ✅ 위젯 값 states로 fragment 하나만 다시 실행 (브라우저에서 fragment 안의 위젯을 건드렸을 때와 같은 요청)
+def fragment_run(at, states=None):
+    fragment_ids = list(at._fragment_storage._fragments)
+    assert len(fragment_ids) == 1, fragment_ids
+    request = partial(RerunData, fragment_id_queue=fragment_ids)
+    with mock.patch("streamlit.testing.v1.local_script_runner.RerunData", request):
+        at._run(states if states is not None else at._tree.get_widget_states())
+
+
+# ✅ 지금 방식: 키가 있는 컴포넌트 값(session_state["point_click"])만 바꾸고 실행
+def click_current(at, x, y):
+    at.session_state["point_click"] = json.dumps([{"x": x, "y": y, "curveNumber": 0, "pointNumber": 0}])
+    fragment_run(at, at._tree.get_widget_states())
+
+
+# ✅ 예전 방식: 키 없는 plotly_events의 위젯 id를 그림에서 찾아 그 값으로 클릭을 보냄
+#    상한에서 끊긴 실행은 그림까지 가지 못하므로, 브라우저에 남아 있는 마지막 컴포넌트 id를 씀
+def click_old(at, x, y):
+    for node in at._tree:
+        if getattr(node, "type", None) == "component_instance":
+            SHOWN_COMPONENT[id(at)] = node.proto.id
+    states = at._tree.get_widget_states()
+    click = states.widgets.add()
+    value = json.dumps([{"x": x, "y": y, "curveNumber": 0, "pointNumber": 0}])     # 컴포넌트가 보내는 값도 JSON 문자열
+    click.CopyFrom(WidgetState(id=SHOWN_COMPONENT[id(at)], json_value=json.dumps(value)))
+    fragment_run(at, states)
+
+
+def measure(old, click, points):
+    at = AppTest.from_function(section2_app, args=(old,), default_timeout=60).run()
+    section2 = counter()
+    before = section2._calls[0]
+    fragment_run(at)                         # 클릭 없는 fragment 실행 한 번 = 패널 한 번
+    per_pass = section2._calls[0] - before
+    times, passes = [], []
+    for x, y in points:
+        before = section2._calls[0]
+        section2._limit[0] = before + MAX_PASSES * per_pass
+        start = time.perf_counter()
+        click(at, x, y)
+        times.append(time.perf_counter() - start)
+        passes.append(min(section2._calls[0] - before, MAX_PASSES * per_pass) / per_pass)
+        assert not at.exception, at.exception
+    section2._limit[0] = None
+    return at, times, passes
+
+
+def report(name, times, passes):
+    ms = sorted(t * 1e3 for t in times)
+    capped = sum(p >= MAX_PASSES for p in passes)
+    note = f", {capped}번은 상한 {MAX_PASSES}회에서 끊음 (멈추지 않는 st.rerun 반복)" if capped else ""
+    print(f"{name:<8} 클릭당 {statistics.median(ms):6.1f} ms (p95 {ms[int(0.95 * (len(ms) - 1))]:6.1f} ms), "
+          f"패널 그리기 {statistics.mean(passes):.1f}회/클릭{note}")
+    return statistics.median(ms)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clicks", type=int, default=50)
+    args = parser.parse_args()
+    os.chdir(ROOT)
+    points = click_points(args.clicks)
+
+    _, old_times, old_passes = measure(True, click_old, points)
+    at, new_times, new_passes = measure(False, click_current, points)
+    x, y = points[-1]
+    assert at.number_input(key="input_x").value == x, "클릭한 점이 입력칸에 반영되지 않음"
+
+    print(f"클릭 {args.clicks}회")
+    old = report("예전", old_times, old_passes)
+    new = report("지금", new_times, new_passes)
+    print(f"클릭당 시간 지금/예전 = {new / old:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+# ✅ app.py 수용 인원 측정 (streamlit 서버 하나가 학생 몇 명까지 버티는지)
+#    N마다 `streamlit run app.py` 서버를 새로 띄우고, 학생 N명을 브라우저 대신 웹소켓 클라이언트로 붙인다.
+#    클라이언트는 브라우저와 같은 메시지를 보낸다: 바꾼 위젯 값(WidgetStates)을 담은 rerun_script를 보내고,
+#    서버가 script_finished를 보낼 때까지 기다린다. fragment 안의 위젯이면 fragment_id를 같이 보내서
+#    브라우저처럼 그 fragment만 다시 실행한다.
+#    세션은 네 섹션에 고르게 나뉘고, 섹션마다 학생이 실제로 하는 조작을 반복한다:
+#        1. 행렬 칸 바꾸기, 도형 바꾸기, 궤도 보기
+#        2. 그래프의 점 클릭, 대칭축 바꾸기, 보기 방식 바꾸기
+#        3. 자취 식·함수 입력, 보기 방식 바꾸기
+#        4. α, β, z 값 바꾸기
+#    실행 중에 예외나 st.error·st.warning이 화면에 나오면 그 조작은 성공으로 세지 않고 오류로 남긴다.
+#    조작 한 번 = 보내고 나서 실행이 끝날 때까지 = 학생이 화면이 바뀌기를 기다리는 시간 (브라우저 그리기 제외).
+#    섹션별 p50/p95/p99와, 서버 프로세스의 CPU 사용률·메모리(RSS)를 /proc에서 읽어 N별로 보여 준다.
+#    클라이언트도 같은 기계에서 돌므로 CPU가 적은 기계에서는 서버와 CPU를 나눠 쓴다.
+#
+#    python benchmarks/streamlit_load_test.py [--sessions 1 4 8 16 32] [--duration 20] [--think 1.0]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SHORT_NAMES = ["1 행렬", "2 대칭", "3 복소평면", "4 회전/이동"]     # 사이드바 메뉴 순서 (app.SECTIONS)
+MENU_LABEL = "📂 실험을 선택하세요"
+SHAPE_LABEL = "도형 종류를 선택하세요"     # 섹션 1의 도형 selectbox (key 없음)
+RUN_TIMEOUT = 120
+FAILED_ALERTS = (Alert.ERROR, Alert.WARNING)     # 이 알림이 나온 실행은 그림을 못 그린 것
+
+LOCI = ["x**2 + y**2 == 1", "2*y == x**2 + 1", "x**2/4 + y**2 == 1", "y == 2*x + 1", "x**2 - y**2 == 1",
+        "(x-1)**2 + (y+1)**2 == 4"]
+FUNCTIONS = ["(z - 1j)**2", "1/z", "z**2", "2*z + 1j", "np.exp(z)", "z*(1+1j)"]
+
+
+def half_step(rng, low=-3, high=3):
+    return rng.randint(2 * low, 2 * high) / 2
+
+
+# ✅ 브라우저 탭 하나 흉내: 화면에 있는 위젯(key 또는 label → proto, fragment)과 학생이 바꾼 값을 기억
+#    다시 실행할 때마다 바꾼 값 전부를 보내는 것도 브라우저와 같음
+class Student:
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.widgets = {}      # 이름 → (위젯 종류, proto, fragment_id)
+        self.values = {}       # 이름 → WidgetState (id 없이 값만)
+        self.errors = []       # 마지막 실행에서 나온 예외·오류 알림
+
+    def widget(self, name):
+        return self.widgets[name][1]
+
+    # 위젯 하나의 값을 바꾸고 다시 실행 → 걸린 시간(초)
+    async def set(self, name, **value):
+        self.values[name] = WidgetState(**value)
+        return await self.rerun(self.widgets[name][2])
+
+    async def rerun(self, fragment_id=""):
+        message = BackMsg()
+        message.rerun_script.page_script_hash = ""
+        for name, state in self.values.items():
+            if name in self.widgets:
+                widget_state = message.rerun_script.widget_states.widgets.add()
+                widget_state.CopyFrom(state)
+                widget_state.id = self.widgets[name][1].id
+        if fragment_id:
+            message.rerun_script.fragment_id = fragment_id
+        else:
+            self.widgets = {}      # 전체 실행이면 화면을 새로 받음
+
+        self.errors = []
+        start = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+        await asyncio.wait_for(self.receive(), RUN_TIMEOUT)
+        return time.perf_counter() - start
+
+    # script_finished(다시 실행 예약 때문에 끝난 것 제외)까지 받으면서 위젯과 오류를 모음
+    async def receive(self):
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.websocket.recv())
+            kind = message.WhichOneof("type")
+            if kind == "script_finished":
+                if message.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return
+            elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                element_type = element.WhichOneof("type")
+                proto = getattr(element, element_type)
+                if element_type == "exception":
+                    self.errors.append(proto.message)
+                elif element_type == "alert" and proto.format in FAILED_ALERTS:
+                    self.errors.append(proto.body)
+                elif getattr(proto, "id", ""):
+                    key = proto.id.rsplit("-", 1)[-1]
+                    name = key if key != "None" else getattr(proto, "label", proto.id)
+                    self.widgets[name] = (element_type, proto, message.delta.fragment_id)
+
+
+# ✅ 섹션별 학생 조작 한 번 → 걸린 시간(초)
+async def act_matrix(student, rng, k):
+    choice = k % 6
+    if choice < 4:
+        return await student.set(["a11", "a12", "a21", "a22"][choice], double_value=half_step(rng))
+    if choice == 4:
+        return await student.set(SHAPE_LABEL, string_value=rng.choice(["삼각형", "사각형", "원", "직선"]))
+    checkbox = student.widget("show_orbit")
+    shown = student.values["show_orbit"].bool_value if "show_orbit" in student.values else checkbox.default
+    return await student.set("show_orbit", bool_value=not shown)
+
+
+async def act_symmetry(student, rng, k):
+    choice = k % 4
+    if choice < 2:
+        x, y = round(rng.uniform(-4, 4), 2), round(rng.uniform(-4, 4), 2)
+        click = json.dumps([{"x": x, "y": y, "curveNumber": 0, "pointNumber": 0}])
+        return await student.set("point_click", json_value=json.dumps(click))     # 컴포넌트 값도 JSON 문자열
+    if choice == 2:
+        return await student.set(rng.choice(["axis1", "axis2"]), string_value=rng.choice(["x축", "y축", "직선y=ax"]))
+    return await student.set("sym_mode", string_value=rng.choice(student.widget("sym_mode").options))
+
+
+async def act_complex(student, rng, k):
+    choice = k % 3
+    if choice == 0:
+        return await student.set("definition_input", string_value=rng.choice(LOCI))
+    if choice == 1:
+        return await student.set("function_input", string_value=rng.choice(FUNCTIONS))
+    return await student.set("view_mode", string_value=rng.choice(student.widget("view_mode").options))
+
+
+async def act_rotation(student, rng, k):
+    key = ["alpha_re", "alpha_im", "beta_re", "beta_im", "z_x", "z_y"][k % 6]
+    if student.widget(key).data_type == NumberInput.INT:
+        return await student.set(key, int_value=int(half_step(rng)))
+    return await student.set(key, double_value=half_step(rng))
+
+
+ACTIONS = [act_matrix, act_symmetry, act_complex, act_rotation]
+
+
+# ✅ 세션 하나: 접속해서 섹션을 고른 뒤, 끝날 때까지 조작 → 실행 끝 기다리기 → 생각하는 시간 반복
+async def session(port, index, deadline, think, results, errors):
+    rng = random.Random(index)
+    section = index % len(SHORT_NAMES)
+    try:
+        async with websockets.connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"],
+                                      max_size=None) as websocket:
+            student = Student(websocket)
+            await student.rerun()
+            await student.set(MENU_LABEL, string_value=student.widget(MENU_LABEL).options[section])
+            errors.extend(f"{SHORT_NAMES[section]} 시작: {message}" for message in student.errors)
+            k = 0
+            while time.perf_counter() < deadline:
+                try:
+                    elapsed = await ACTIONS[section](student, rng, k)
+                    if student.errors:
+                        errors.extend(f"{SHORT_NAMES[section]}: {message}" for message in student.errors)
+                    else:
+                        results[section].append(elapsed)
+                except (KeyError, asyncio.TimeoutError) as e:     # 위젯이 화면에 없거나 실행이 끝나지 않음
+                    errors.append(f"{SHORT_NAMES[section]}: {type(e).__name__}: {e}")
+                k += 1
+                if think > 0:
+                    await asyncio.sleep(rng.expovariate(1 / think))
+    except Exception as e:     # 접속이 끊긴 세션도 결과에 남김
+        errors.append(f"{SHORT_NAMES[section]}: {type(e).__name__}: {e}")
+
+
+# ✅ 클라이언트 프로세스 하나가 여러 세션을 이벤트 루프 하나로 맡음
+def client_process(args):
+    port, indices, duration, think = args
+    results = [[] for _ in SHORT_NAMES]
+    errors = []
+
+    async def run_all():
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(session(port, i, deadline, think, results, errors) for i in indices))
+    asyncio.run(run_all())
+    return results, errors
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, proc, timeout=60):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if proc.poll() is not None:
+            raise RuntimeError("streamlit 서버가 시작하지 못했습니다")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("서버 준비 시간 초과")
+
+
+# ✅ 서버 프로세스의 누적 CPU 시간(초)과 현재·최대 메모리(MB)
+def server_usage(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    memory = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(("VmRSS", "VmHWM")):
+                name, value = line.split(":")
+                memory[name] = int(value.split()[0]) / 1024
+    return cpu, memory["VmRSS"], memory["VmHWM"]
+
+
+# ✅ 서버를 새로 띄워 세션 N개를 동시에 붙이고 결과를 모음
+def measure(n, args):
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+                             "--server.port", str(port), "--server.fileWatcherType", "none",
+                             "--browser.gatherUsageStats", "false"],
+                            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port, proc)
+        procs = max(1, min(args.client_procs, n))
+        shares = [list(range(n))[i::procs] for i in range(procs)]
+        cpu_start, wall_start = server_usage(proc.pid)[0], time.perf_counter()
+        with multiprocessing.Pool(procs) as pool:
+            outputs = pool.map(client_process, [(port, share, args.duration, args.think) for share in shares])
+        wall = time.perf_counter() - wall_start
+        cpu_end, rss, peak_rss = server_usage(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {
+        "latencies": [sum((results[s] for results, _ in outputs), []) for s in range(len(SHORT_NAMES))],
+        "errors": sum((errors for _, errors in outputs), []),
+        "cpu": (cpu_end - cpu_start) / wall,
+        "rss": rss,
+        "peak_rss": peak_rss,
+        "wall": wall,
+    }
+
+
+def report(n, result):
+    reruns = sum(len(samples) for samples in result["latencies"])
+    print(f"\nN = {n}  (rerun {reruns / result['wall']:.1f}/s, 서버 CPU {result['cpu'] * 100:.0f}%, "
+          f"RSS {result['rss']:.0f} MB, 최대 {result['peak_rss']:.0f} MB, 오류 {len(result['errors'])})")
+    print(f"  {'섹션':<12}{'rerun':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, samples in zip(SHORT_NAMES, result["latencies"]):
+        if not samples:
+            print(f"  {name:<12}{0:>7}")
+            continue
+        p50, p95, p99 = np.percentile(np.array(samples) * 1e3, [50, 95, 99])
+        print(f"  {name:<12}{len(samples):>7}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}")
+    for message in sorted(set(result["errors"]))[:5]:
+        print(f"  ! {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8, 16, 32],
+                        help="동시 세션 수 N (세션 i는 i %% 4번째 섹션을 맡음)")
+    parser.add_argument("--duration", type=float, default=20.0, help="N마다 측정 시간 (초)")
+    parser.add_argument("--think", type=float, default=1.0, help="조작 사이 평균 생각 시간 (초, 0이면 쉬지 않음)")
+    parser.add_argument("--client-procs", type=int, default=max(1, multiprocessing.cpu_count() // 2),
+                        help="세션을 나눠 맡는 클라이언트 프로세스 수")
+    args = parser.parse_args()
+
+    print(f"python {sys.version.split()[0]}, CPU {os.cpu_count()}개, N마다 {args.duration:.0f}초, "
+          f"생각 시간 평균 {args.think:.1f}초")
+    for n in args.sessions:
+        report(n, measure(n, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,23 @@
+import os
+from functools import lru_cache
 import dash
-from dash import dcc, html, Input, Output, State
+from dash import dcc, html, Input, Output, State, Patch, ClientsideFunction, ctx, no_update
 import plotly.graph_objs as go
 import numpy as np
 
 app = dash.Dash(__name__)
 server = app.server
 
+# 슬라이더 계산을 브라우저에서 할지 (assets/symmetry.js), 서버에서 Patch로 할지
+CLIENTSIDE = os.environ.get("SYMMETRY_CLIENTSIDE", "1") == "1"
+
+# 축 직선은 화면(-6~6)을 가로지르는 양 끝점 두 개면 충분
+LINE_EXTENT = 6
+
+# 원래 점을 끌 수 있는 원 모양(shapes[0])으로 그림 — 반지름은 좌표 단위
+POINT_RADIUS = 0.2
+POINT_KEYS = ('shapes[0].x0', 'shapes[0].x1', 'shapes[0].y0', 'shapes[0].y1')
+
 # 초기 점 위치
 def get_initial_point():
     return 3.0, 1.0
@@ -26,7 +38,7 @@ def get_symmetry_matrix(axis_type, angle_degree=None):
 
 # 직선 방정식 생성 (y = ax)
 def get_line_coordinates(axis_type, angle_degree=None):
-    x = np.linspace(-6, 6, 100)
+    x = np.array([-LINE_EXTENT, LINE_EXTENT], dtype=float)
     if axis_type == "x축":
         return x, np.zeros_like(x)
     elif axis_type == "y축":
@@ -37,6 +49,31 @@ def get_line_coordinates(axis_type, angle_degree=None):
     else:
         return x, np.zeros_like(x)
 
+# 끌 수 있는 점 모양 (원의 중심이 점 위치)
+def point_shape(x0, y0):
+    return dict(type='circle', xref='x', yref='y',
+                x0=x0 - POINT_RADIUS, x1=x0 + POINT_RADIUS,
+                y0=y0 - POINT_RADIUS, y1=y0 + POINT_RADIUS,
+                fillcolor='blue', line=dict(color='blue'), opacity=0.6,
+                layer='above', editable=True)
+
+# 원래 점 → 첫 번째 대칭 → 두 번째 대칭을 잇는 선
+def reflection_path(x0, y0, A, B):
+    first = A @ np.array([x0, y0])
+    second = B @ first
+    return [x0, float(first[0]), float(second[0])], [y0, float(first[1]), float(second[1])]
+
+# relayoutData에서 끌어 놓은 점의 위치 (원의 중심) — 줌·새로 그린 경로 등 다른 변경이면 None
+def point_from_relayout(relayoutData, point):
+    if not relayoutData or not any(key in relayoutData for key in POINT_KEYS):
+        return None
+    x0, x1, y0, y1 = (relayoutData.get(key) for key in POINT_KEYS)
+    x = (x0 + x1) / 2 if x0 is not None and x1 is not None else point[0]
+    y = (y0 + y1) / 2 if y0 is not None and y1 is not None else point[1]
+    if [x, y] == list(point):
+        return None
+    return [x, y]
+
 # 그래프 생성
 def generate_figure(x0, y0, axis1, angle1, axis2, angle2):
     point = np.array([x0, y0])
@@ -46,6 +83,7 @@ def generate_figure(x0, y0, axis1, angle1, axis2, angle2):
 
     x_line1, y_line1 = get_line_coordinates(axis1, angle1)
     x_line2, y_line2 = get_line_coordinates(axis2, angle2)
+    x_path, y_path = reflection_path(x0, y0, A, B)
 
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=[x0], y=[y0], mode='markers',
@@ -60,8 +98,12 @@ def generate_figure(x0, y0, axis1, angle1, axis2, angle2):
     fig.add_trace(go.Scatter(x=x_line2, y=y_line2, mode='lines',
                              line=dict(color='green', dash='dot'),
                              name='두 번째 축'))
+    fig.add_trace(go.Scatter(x=x_path, y=y_path, mode='lines',
+                             line=dict(color='gray', width=1),
+                             name='연결선'))
 
     fig.update_layout(
+        shapes=[point_shape(x0, y0)],
         dragmode='drawopenpath',
         clickmode='event+select',
         xaxis=dict(range=[-6, 6], scaleanchor='y'),
@@ -72,6 +114,40 @@ def generate_figure(x0, y0, axis1, angle1, axis2, angle2):
     )
     return fig
 
+# 축 조합별로 변하지 않는 부분 (두 대칭 행렬과 축 직선) — 워커마다 메모리에 캐시
+#   각도는 y=ax일 때만 의미가 있으므로 나머지 축이면 None으로 바꿔서 같은 조합으로 봄
+def axis_key(axis1, angle1, axis2, angle2):
+    return (axis1, angle1 if axis1 == "y=ax" else None, axis2, angle2 if axis2 == "y=ax" else None)
+
+@lru_cache(maxsize=4096)
+def axis_data(axis1, angle1, axis2, angle2):
+    A, B = get_symmetry_matrix(axis1, angle1), get_symmetry_matrix(axis2, angle2)
+    A.flags.writeable = B.flags.writeable = False     # 캐시에서 꺼낸 행렬이 바뀌지 않도록
+    lines = [np.stack(get_line_coordinates(axis, angle)).tolist()
+             for axis, angle in ((axis1, angle1), (axis2, angle2))]
+    return A, B, lines
+
+# 바뀐 trace 데이터만 보내는 부분 업데이트 (레이아웃·스타일은 그대로)
+# trace 순서: 0 원래 점, 1 변환된 점, 2 첫 번째 축, 3 두 번째 축, 4 연결선
+# 점만 옮겼으면(point_only) 축 직선은 그대로 두고 점과 연결선만 고침
+def figure_patch(x0, y0, axis1, angle1, axis2, angle2, point_only=False):
+    A, B, lines = axis_data(*axis_key(axis1, angle1, axis2, angle2))
+    x_path, y_path = reflection_path(x0, y0, A, B)
+
+    patch = Patch()
+    patch['data'][0]['x'] = [x0]
+    patch['data'][0]['y'] = [y0]
+    patch['data'][1]['x'] = x_path[-1:]
+    patch['data'][1]['y'] = y_path[-1:]
+    patch['data'][4]['x'] = x_path
+    patch['data'][4]['y'] = y_path
+    if point_only:
+        return patch
+    for trace, (x_line, y_line) in zip((2, 3), lines):
+        patch['data'][trace]['x'] = x_line
+        patch['data'][trace]['y'] = y_line
+    return patch
+
 # 앱 레이아웃
 app.layout = html.Div([
     html.H2("🟨 두 번의 대칭이동 시뮬레이터 (Dash 기반)"),
@@ -85,7 +161,7 @@ app.layout = html.Div([
         ),
         dcc.Slider(id='angle1', min=-90, max=90, step=1, value=45,
                    marks={-90: '-90°', 0: '0°', 90: '90°'},
-                   tooltip={"placement": "bottom"}),
+                   tooltip={"placement": "bottom"}, updatemode='drag'),
 
         html.Br(),
 
@@ -97,7 +173,7 @@ app.layout = html.Div([
         ),
         dcc.Slider(id='angle2', min=-90, max=90, step=1, value=-45,
                    marks={-90: '-90°', 0: '0°', 90: '90°'},
-                   tooltip={"placement": "bottom"})
+                   tooltip={"placement": "bottom"}, updatemode='drag')
     ], style={'width': '40%', 'display': 'inline-block', 'verticalAlign': 'top'}),
 
     html.Div([
@@ -105,31 +181,53 @@ app.layout = html.Div([
             id='graph',
             config={'editable': True},
             figure=generate_figure(*get_initial_point(), 'x축', 45, 'y축', -45)
-        )
+        ),
+        dcc.Store(id='point', data=list(get_initial_point()))
     ], style={'width': '58%', 'display': 'inline-block'})
 ])
 
-# 콜백
-@app.callback(
-    Output('graph', 'figure'),
-    Input('graph', 'relayoutData'),
+# 콜백: 점 위치는 Store에 두고, 그림은 바뀐 trace 데이터만 고침
+#   점 원(shapes[0])은 plotly가 끌어 놓을 때 한 번만 relayout을 보내고,
+#   점과 관계없는 relayout(줌, 새로 그린 경로)이나 같은 위치면 Store를 바꾸지 않음
+FIGURE_INPUTS = [
     Input('axis1', 'value'),
     Input('angle1', 'value'),
     Input('axis2', 'value'),
     Input('angle2', 'value'),
-    State('graph', 'figure')
-)
-def update_graph(relayoutData, axis1, angle1, axis2, angle2, fig):
-    x0, y0 = get_initial_point()
-
-    # 추후 확장 가능: 드래그한 점 위치 읽기
-    if relayoutData and 'shapes[0].x0' in relayoutData:
-        x0 = relayoutData['shapes[0].x0']
-        y0 = relayoutData['shapes[0].y0']
+    Input('point', 'data'),
+]
+
+if CLIENTSIDE:
+    # 슬라이더·점 끌기 모두 서버 요청 없이 브라우저에서 계산 (assets/symmetry.js)
+    app.clientside_callback(
+        ClientsideFunction(namespace='symmetry', function_name='pointFromRelayout'),
+        Output('point', 'data'),
+        Input('graph', 'relayoutData'),
+        State('point', 'data'),
+        prevent_initial_call=True
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='symmetry', function_name='updateFigure'),
+        Output('graph', 'figure'),
+        *FIGURE_INPUTS
+    )
+else:
+    @app.callback(
+        Output('point', 'data'),
+        Input('graph', 'relayoutData'),
+        State('point', 'data'),
+        prevent_initial_call=True
+    )
+    def update_point(relayoutData, point):
+        moved = point_from_relayout(relayoutData, point)
+        return no_update if moved is None else moved
 
-    return generate_figure(x0, y0, axis1, angle1, axis2, angle2)
+    @app.callback(Output('graph', 'figure'), *FIGURE_INPUTS)
+    def update_graph(axis1, angle1, axis2, angle2, point):
+        point_only = ctx.triggered_id == 'point'
+        return figure_patch(point[0], point[1], axis1, angle1, axis2, angle2, point_only)
 
-# 실행
+# 실행 (개발용 — 여러 워커로 운영할 때는 serve_dash.py)
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8050)
 
@@ -0,0 +1,480 @@
+import ast
+import operator
+from functools import lru_cache
+
+import numpy as np
+
+# ✅ 안전한 수식 컴파일러
+#    입력 문자열을 AST로 한 번만 해석하고, 허용된 연산/이름/np 함수만 쓰는 벡터화 함수로 만든다.
+#    (eval을 쓰지 않으므로 공개 서비스에서도 임의의 파이썬 코드가 실행되지 않음)
+
+CACHE_SIZE = 256
+MAX_LENGTH = 500           # 입력 식 최대 글자 수
+MAX_DEPTH = 50             # 식 트리 최대 깊이 (괄호·단항 연산 중첩, 재귀 한도 보호)
+
+# 허용된 np 함수 (모두 배열에 대해 벡터화됨)
+ALLOWED_FUNCTIONS = {
+    name: getattr(np, name) for name in (
+        'sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan', 'arctan2',
+        'sinh', 'cosh', 'tanh', 'arcsinh', 'arccosh', 'arctanh',
+        'exp', 'log', 'log2', 'log10', 'sqrt', 'cbrt', 'square',
+        'abs', 'absolute', 'sign', 'floor', 'ceil', 'hypot',
+        'real', 'imag', 'conj', 'conjugate', 'angle',
+        'maximum', 'minimum', 'power',
+    )
+}
+ALLOWED_CONSTANTS = {'pi': np.pi, 'e': np.e}
+# ufunc가 아닌 허용 함수의 인자 수 (ufunc는 nin) — 추가 인자(out, deg 등)로 입력 배열을 덮어쓰지 못하게
+_FUNCTION_ARITY = {np.real: 1, np.imag: 1, np.angle: 1}
+
+# 변수 묶음 (i는 허수단위)
+LOCUS_VARIABLES = ('x', 'y')
+FUNCTION_VARIABLES = ('z',)
+_IMAGINARY_UNIT = {'i': 1j}
+
+_BINARY_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.Pow: operator.pow, ast.Mod: operator.mod,
+    ast.FloorDiv: operator.floordiv,
+    ast.BitAnd: np.logical_and, ast.BitOr: np.logical_or, ast.BitXor: np.logical_xor,
+}
+_UNARY_OPS = {
+    ast.USub: operator.neg, ast.UAdd: operator.pos,
+    ast.Not: np.logical_not, ast.Invert: np.logical_not,
+}
+_COMPARE_OPS = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+    ast.Lt: operator.lt, ast.LtE: operator.le,
+    ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+# ✅ 컴파일된 수식
+#    kind: 'equation'(L == R, func는 L - R), 'condition'(부등식/논리식), 'value'(일반 식)
+class CompiledExpression:
+    __slots__ = ('text', 'kind', 'tree', '_func', '_names', '_classifier', '_interval_complete')
+
+    def __init__(self, text, kind, tree, func, names):
+        self.text = text
+        self.kind = kind
+        self.tree = tree
+        self._func = func
+        self._names = names
+        self._classifier = None
+        self._interval_complete = False
+
+    def __call__(self, **values):
+        with np.errstate(all='ignore'):
+            return self._func(values)
+
+    # ✅ 구간 연산으로 직사각형 블록 전체의 참/거짓 판정
+    #    인자: 변수별 (최솟값 배열, 최댓값 배열) → (전부 참, 전부 거짓) 불리언 배열
+    #    둘 다 False인 블록은 '섞임'(경계가 지나가거나 판정 불가)
+    def classify(self, **bounds):
+        self._ensure_classifier()
+        shape = np.broadcast(*[b for pair in bounds.values() for b in pair]).shape
+        with np.errstate(all='ignore'):
+            is_true, is_false = self._classifier(bounds)
+        return np.broadcast_to(is_true, shape), np.broadcast_to(is_false, shape)
+
+    # ✅ 모든 노드를 구간으로 계산할 수 있는지 (아니면 가지치기 효과가 거의 없음)
+    @property
+    def supports_intervals(self):
+        self._ensure_classifier()
+        return self._interval_complete
+
+    def _ensure_classifier(self):
+        if self._classifier is None:
+            missing = []
+            self._classifier = _build_truth(self.tree, self._names, missing)
+            self._interval_complete = not missing
+
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r}, kind={self.kind!r})"
+
+
+# ✅ 공백을 정리한 식 (캐시 키)
+def normalize_expression(text):
+    return ' '.join(str(text).split())
+
+
+# ✅ 식 컴파일 (정규화된 식 기준으로 LRU 캐시)
+def compile_expression(text, variables):
+    return _compile_cached(normalize_expression(text), tuple(variables))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_cached(text, variables):
+    if not text:
+        raise ExpressionError("식이 비어 있습니다.")
+    if len(text) > MAX_LENGTH:
+        raise ExpressionError(f"식이 너무 깁니다. ({MAX_LENGTH}자 이하)")
+    try:
+        tree = ast.parse(text, mode='eval').body
+    except SyntaxError as e:
+        raise ExpressionError(f"문법 오류: {e.msg}") from None
+    except (RecursionError, MemoryError):
+        raise ExpressionError("식이 너무 깊게 중첩되어 있습니다.") from None
+    if _depth(tree) > MAX_DEPTH:
+        raise ExpressionError(f"식이 너무 깊게 중첩되어 있습니다. (깊이 {MAX_DEPTH} 이하)")
+
+    names = set(variables) | set(_IMAGINARY_UNIT)
+    if isinstance(tree, ast.Compare) and len(tree.ops) == 1 and isinstance(tree.ops[0], ast.Eq):
+        left = _build(tree.left, names)
+        right = _build(tree.comparators[0], names)
+        kind = 'equation'
+        func = lambda env: left(env) - right(env)  # noqa: E731
+    else:
+        kind = 'condition' if _is_condition(tree) else 'value'
+        func = _build(tree, names)
+    return CompiledExpression(text, kind, tree, func, names)
+
+
+# ✅ 트리 깊이 (재귀 없이 — 깊은 입력에서도 RecursionError가 나지 않게)
+def _depth(tree):
+    deepest = 0
+    stack = [(tree, 1)]
+    while stack:
+        node, depth = stack.pop()
+        deepest = max(deepest, depth)
+        stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+    return deepest
+
+
+def _is_condition(node):
+    if isinstance(node, (ast.Compare, ast.BoolOp)):
+        return True
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+        return True
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr, ast.BitXor)):
+        return True
+    return False
+
+
+# ✅ np.sin 같은 속성 접근 → 허용된 함수/상수
+def _resolve_attribute(node):
+    if not (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'np'):
+        raise ExpressionError("np.함수 형태만 사용할 수 있습니다.")
+    if node.attr in ALLOWED_FUNCTIONS:
+        return ALLOWED_FUNCTIONS[node.attr]
+    if node.attr in ALLOWED_CONSTANTS:
+        return ALLOWED_CONSTANTS[node.attr]
+    raise ExpressionError(f"허용되지 않는 함수: np.{node.attr}")
+
+
+# ✅ AST → 벡터화 함수(env → 배열) 로 변환
+def _build(node, names):
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float, complex)):
+            raise ExpressionError(f"허용되지 않는 상수: {value!r}")
+        # 정수는 실수로 바꿔 거대한 정수 거듭제곱(9**9**9 등)을 막음
+        value = float(value) if isinstance(value, int) else value
+        return lambda env: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in _IMAGINARY_UNIT:
+            value = _IMAGINARY_UNIT[name]
+            return lambda env: value
+        if name in ALLOWED_CONSTANTS:
+            value = ALLOWED_CONSTANTS[name]
+            return lambda env: value
+        if name in names:
+            return lambda env: env[name]
+        raise ExpressionError(f"허용되지 않는 이름: {name}")
+
+    if isinstance(node, ast.Attribute):
+        value = _resolve_attribute(node)
+        if callable(value):
+            raise ExpressionError(f"함수 np.{node.attr} 는 괄호와 함께 호출해야 합니다.")
+        return lambda env: value
+
+    if isinstance(node, ast.BinOp):
+        op = _BINARY_OPS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"허용되지 않는 연산: {type(node.op).__name__}")
+        left = _build(node.left, names)
+        right = _build(node.right, names)
+        return lambda env: op(left(env), right(env))
+
+    if isinstance(node, ast.UnaryOp):
+        op = _UNARY_OPS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"허용되지 않는 연산: {type(node.op).__name__}")
+        operand = _build(node.operand, names)
+        return lambda env: op(operand(env))
+
+    if isinstance(node, ast.Compare):
+        # 0 < x < 1 같은 연쇄 비교도 배열에서 동작하도록 논리곱으로 연결
+        operands = [_build(node.left, names)] + [_build(c, names) for c in node.comparators]
+        ops = []
+        for op_node in node.ops:
+            op = _COMPARE_OPS.get(type(op_node))
+            if op is None:
+                raise ExpressionError(f"허용되지 않는 비교: {type(op_node).__name__}")
+            ops.append(op)
+
+        def compare(env):
+            values = [f(env) for f in operands]
+            result = ops[0](values[0], values[1])
+            for k in range(1, len(ops)):
+                result = np.logical_and(result, ops[k](values[k], values[k + 1]))
+            return result
+        return compare
+
+    if isinstance(node, ast.BoolOp):
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        parts = [_build(v, names) for v in node.values]
+
+        def boolean(env):
+            result = parts[0](env)
+            for part in parts[1:]:
+                result = combine(result, part(env))
+            return result
+        return boolean
+
+    if isinstance(node, ast.Call):
+        if node.keywords or any(isinstance(a, ast.Starred) for a in node.args):
+            raise ExpressionError("함수 인자는 위치 인자만 사용할 수 있습니다.")
+        if isinstance(node.func, ast.Name) and node.func.id == 'abs':
+            func = np.abs
+        else:
+            func = _resolve_attribute(node.func)
+            if not callable(func):
+                raise ExpressionError(f"np.{node.func.attr} 는 함수가 아닙니다.")
+        arity = func.nin if isinstance(func, np.ufunc) else _FUNCTION_ARITY[func]
+        if len(node.args) != arity:
+            raise ExpressionError(f"{ast.unparse(node.func)} 는 인자를 {arity}개 받습니다.")
+        args = [_build(a, names) for a in node.args]
+        return lambda env: func(*[a(env) for a in args])
+
+    raise ExpressionError(f"허용되지 않는 표현: {type(node).__name__}")
+
+
+# ─────────────────────────── 구간 연산 ───────────────────────────
+# 수치 노드 → env → (lo, hi), 논리 노드 → env → (전부 참, 전부 거짓)
+# 지원하지 않는 노드(복소수, 주기 불명 함수 등)는 (-inf, inf) 로 두어 '섞임'으로 처리되게 한다.
+
+_UNKNOWN = (-np.inf, np.inf)
+
+
+def _clean(lo, hi):
+    # NaN(0 * inf 등)은 판정 불가로 바꿈
+    return np.where(np.isnan(lo), -np.inf, lo), np.where(np.isnan(hi), np.inf, hi)
+
+
+def _interval_mul(a, b):
+    p = (a[0] * b[0], a[0] * b[1], a[1] * b[0], a[1] * b[1])
+    return _clean(np.minimum(np.minimum(p[0], p[1]), np.minimum(p[2], p[3])),
+                  np.maximum(np.maximum(p[0], p[1]), np.maximum(p[2], p[3])))
+
+
+def _interval_reciprocal(a):
+    contains_zero = (a[0] <= 0) & (a[1] >= 0)
+    return (np.where(contains_zero, -np.inf, 1 / a[1]),
+            np.where(contains_zero, np.inf, 1 / a[0]))
+
+
+def _interval_even(a, f):
+    # 0에서 최소인 짝함수 (x**2, abs, cosh)
+    flo, fhi = f(a[0]), f(a[1])
+    straddles = (a[0] < 0) & (a[1] > 0)
+    return np.where(straddles, f(0.0), np.minimum(flo, fhi)), np.maximum(flo, fhi)
+
+
+def _interval_power(a, n):
+    if n == int(n):
+        n = int(n)
+        if n == 0:
+            return 1.0, 1.0
+        if n < 0:
+            return _interval_reciprocal(_interval_power(a, -n))
+        if n % 2 == 0:
+            return _interval_even(a, lambda v: v ** n)
+        return a[0] ** n, a[1] ** n
+    # 정수가 아닌 지수: 음수 구간이 섞이면 NaN이 생길 수 있으므로 판정 불가
+    lo, hi = np.maximum(a[0], 0) ** n, a[1] ** n
+    if n < 0:
+        lo, hi = hi, lo
+    negative = a[0] < 0
+    return np.where(negative, -np.inf, lo), np.where(negative, np.inf, hi)
+
+
+def _interval_sin(a, phase=0.0):
+    # sin(x + phase): 구간 안에 최댓점/최솟점이 있으면 ±1
+    lo, hi = a[0] + phase, a[1] + phase
+    flo, fhi = np.sin(lo), np.sin(hi)
+    has_max = np.floor((hi - np.pi / 2) / (2 * np.pi)) >= np.ceil((lo - np.pi / 2) / (2 * np.pi))
+    has_min = np.floor((hi + np.pi / 2) / (2 * np.pi)) >= np.ceil((lo + np.pi / 2) / (2 * np.pi))
+    return (np.where(has_min, -1.0, np.minimum(flo, fhi)),
+            np.where(has_max, 1.0, np.maximum(flo, fhi)))
+
+
+def _monotone(f, domain_lo=-np.inf, domain_hi=np.inf, open_lo=False, decreasing=False):
+    # 정의역을 벗어나는 구간은 NaN이 섞이므로 판정 불가
+    def apply(a):
+        outside = (a[0] <= domain_lo if open_lo else a[0] < domain_lo) | (a[1] > domain_hi)
+        lo, hi = f(np.clip(a[0], domain_lo, domain_hi)), f(np.clip(a[1], domain_lo, domain_hi))
+        if decreasing:
+            lo, hi = hi, lo
+        return np.where(outside, -np.inf, lo), np.where(outside, np.inf, hi)
+    return apply
+
+
+_INTERVAL_FUNCTIONS = {
+    'exp': _monotone(np.exp), 'arctan': _monotone(np.arctan), 'tanh': _monotone(np.tanh),
+    'sinh': _monotone(np.sinh), 'arcsinh': _monotone(np.arcsinh), 'cbrt': _monotone(np.cbrt),
+    'floor': _monotone(np.floor), 'ceil': _monotone(np.ceil),
+    'sqrt': _monotone(np.sqrt, 0.0), 'log': _monotone(np.log, 0.0, open_lo=True),
+    'log2': _monotone(np.log2, 0.0, open_lo=True), 'log10': _monotone(np.log10, 0.0, open_lo=True),
+    'arcsin': _monotone(np.arcsin, -1.0, 1.0), 'arccosh': _monotone(np.arccosh, 1.0),
+    'arctanh': _monotone(np.arctanh, -1.0, 1.0, open_lo=True),
+    'arccos': _monotone(np.arccos, -1.0, 1.0, decreasing=True),
+    'abs': lambda a: _interval_even(a, np.abs), 'absolute': lambda a: _interval_even(a, np.abs),
+    'square': lambda a: _interval_even(a, np.square), 'cosh': lambda a: _interval_even(a, np.cosh),
+    'sin': _interval_sin, 'cos': lambda a: _interval_sin(a, np.pi / 2),
+    'real': lambda a: a,
+}
+
+
+def _constant_value(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return float(node.value)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _constant_value(node.operand)
+        if value is not None:
+            return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.Name) and node.id in ALLOWED_CONSTANTS:
+        return ALLOWED_CONSTANTS[node.id]
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'np' \
+            and node.attr in ALLOWED_CONSTANTS:
+        return ALLOWED_CONSTANTS[node.attr]
+    return None
+
+
+def _unknown_interval(node, missing):
+    # 구간을 계산할 수 없는 노드는 기록해 두고 (-inf, inf) 로 처리
+    missing.append(node)
+    return lambda env: _UNKNOWN
+
+
+def _build_interval(node, names, missing):
+
+    value = _constant_value(node)
+    if value is not None:
+        return lambda env: (value, value)
+
+    if isinstance(node, ast.Name) and node.id in names and node.id not in _IMAGINARY_UNIT:
+        name = node.id
+        return lambda env: env[name]
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _build_interval(node.operand, names, missing)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        return lambda env: (lambda a: (-a[1], -a[0]))(operand(env))
+
+    if isinstance(node, ast.BinOp):
+        left = _build_interval(node.left, names, missing)
+        if isinstance(node.op, ast.Pow):
+            exponent = _constant_value(node.right)
+            if exponent is None:
+                return _unknown_interval(node, missing)
+            return lambda env: _clean(*_interval_power(left(env), exponent))
+        right = _build_interval(node.right, names, missing)
+        if isinstance(node.op, ast.Add):
+            return lambda env: (lambda a, b: _clean(a[0] + b[0], a[1] + b[1]))(left(env), right(env))
+        if isinstance(node.op, ast.Sub):
+            return lambda env: (lambda a, b: _clean(a[0] - b[1], a[1] - b[0]))(left(env), right(env))
+        if isinstance(node.op, ast.Mult):
+            return lambda env: _interval_mul(left(env), right(env))
+        if isinstance(node.op, ast.Div):
+            return lambda env: _interval_mul(left(env), _interval_reciprocal(right(env)))
+        return _unknown_interval(node, missing)
+
+    if isinstance(node, ast.Call) and len(node.args) == 1:
+        if isinstance(node.func, ast.Name) and node.func.id == 'abs':
+            name = 'abs'
+        elif isinstance(node.func, ast.Attribute):
+            name = node.func.attr
+        else:
+            return _unknown_interval(node, missing)
+        func = _INTERVAL_FUNCTIONS.get(name)
+        if func is None:
+            return _unknown_interval(node, missing)
+        arg = _build_interval(node.args[0], names, missing)
+        return lambda env: _clean(*func(arg(env)))
+
+    return _unknown_interval(node, missing)
+
+
+def _compare_truth(op, a, b):
+    # (전부 참, 전부 거짓)
+    if isinstance(op, ast.Lt):
+        return a[1] < b[0], a[0] >= b[1]
+    if isinstance(op, ast.LtE):
+        return a[1] <= b[0], a[0] > b[1]
+    if isinstance(op, ast.Gt):
+        return a[0] > b[1], a[1] <= b[0]
+    if isinstance(op, ast.GtE):
+        return a[0] >= b[1], a[1] < b[0]
+    apart = (a[1] < b[0]) | (a[0] > b[1])
+    same_point = (a[0] == a[1]) & (b[0] == b[1]) & (a[0] == b[0])
+    if isinstance(op, ast.Eq):
+        return same_point, apart
+    return apart, same_point
+
+
+def _build_truth(node, names, missing):
+    if isinstance(node, ast.Compare):
+        operands = [_build_interval(node.left, names, missing)]
+        operands += [_build_interval(c, names, missing) for c in node.comparators]
+        ops = node.ops
+
+        def compare(env):
+            values = [f(env) for f in operands]
+            is_true, is_false = True, False
+            for k, op in enumerate(ops):
+                t, f = _compare_truth(op, values[k], values[k + 1])
+                is_true, is_false = is_true & t, is_false | f
+            return is_true, is_false
+        return compare
+
+    if isinstance(node, ast.BoolOp) or (isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr))):
+        conjunction = isinstance(node.op, (ast.And, ast.BitAnd))
+        values = node.values if isinstance(node, ast.BoolOp) else (node.left, node.right)
+        parts = [_build_truth(v, names, missing) for v in values]
+
+        def boolean(env):
+            results = [part(env) for part in parts]
+            if conjunction:
+                return (np.logical_and.reduce([r[0] for r in results]),
+                        np.logical_or.reduce([r[1] for r in results]))
+            return (np.logical_or.reduce([r[0] for r in results]),
+                    np.logical_and.reduce([r[1] for r in results]))
+        return boolean
+
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitXor):
+        left, right = _build_truth(node.left, names, missing), _build_truth(node.right, names, missing)
+
+        def exclusive(env):
+            (lt, lf), (rt, rf) = left(env), right(env)
+            return (lt & rf) | (lf & rt), (lt & rt) | (lf & rf)
+        return exclusive
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+        operand = _build_truth(node.operand, names, missing)
+        return lambda env: operand(env)[::-1]
+
+    # 수치식의 참/거짓 = 0이 아닌지 (NaN은 참이므로 판정 불가 구간은 섞임)
+    interval = _build_interval(node, names, missing)
+
+    def nonzero(env):
+        lo, hi = interval(env)
+        return (lo > 0) | (hi < 0), (lo == 0) & (hi == 0)
+    return nonzero
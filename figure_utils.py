@@ -0,0 +1,68 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# ✅ 큰 점 데이터를 화면 해상도에 맞춰 줄이는 도구
+#    같은 화면 픽셀에 겹치는 점은 하나만 남기고, 점이 많으면 WebGL(Scattergl)로 그린다.
+
+WEBGL_THRESHOLD = 5000   # 이보다 점이 많으면 Scattergl 사용
+
+
+# ✅ 복소수 점 → 화면 픽셀 번호 (보이지 않는 NaN/inf 점은 -1)
+def _pixel_keys(points, x_range, y_range, width, height):
+    x0, x1 = x_range
+    y0, y1 = y_range
+    finite = np.isfinite(points)
+    with np.errstate(invalid='ignore'):
+        px = np.floor((points.real - x0) / (x1 - x0) * width)
+        py = np.floor((points.imag - y0) / (y1 - y0) * height)
+    px = np.clip(np.nan_to_num(px), 0, width - 1).astype(np.int64)
+    py = np.clip(np.nan_to_num(py), 0, height - 1).astype(np.int64)
+    return np.where(finite, py * width + px, -1)
+
+
+# ✅ 점 구름 솎아내기: 픽셀마다 첫 번째 점만 남김 → (남은 점, 생략한 점 수)
+#    return_index=True 이면 남은 점의 인덱스를 돌려줌 (z와 f(z)를 짝지어 고를 때)
+def decimate_points(points, x_range, y_range, width, height, return_index=False):
+    keys = _pixel_keys(points, x_range, y_range, width, height)
+    visible = np.nonzero(keys >= 0)[0]
+    _, first = np.unique(keys[visible], return_index=True)
+    index = visible[np.sort(first)]
+    return (index if return_index else points[index]), points.size - index.size
+
+
+# ✅ NaN으로 끊긴 폴리라인 솎아내기: 같은 픽셀에 연달아 찍히는 점만 생략
+#    (끊김 표시 NaN과 각 선의 양 끝점은 그대로 둠)
+def decimate_polyline(points, x_range, y_range, width, height, return_index=False):
+    if points.size == 0:
+        return (np.arange(0) if return_index else points), 0
+    keys = _pixel_keys(points, x_range, y_range, width, height)
+    gap = keys < 0
+    keep = np.ones(points.size, dtype=bool)
+    keep[1:-1] = gap[1:-1] | (keys[1:-1] != keys[:-2]) | gap[:-2] | gap[2:]
+    index = np.nonzero(keep)[0]
+    return (index if return_index else points[index]), points.size - index.size
+
+
+# ✅ 화면 밖 폴리라인 잘라내기: 화면 안 점과 그 양옆 점만 남기고 나머지는 NaN 끊김 하나로
+#    (발산하는 궤도처럼 대부분이 화면 밖인 선을 보낼 때)
+def clip_polyline(points, x_range, y_range):
+    if points.size == 0:
+        return points, 0
+    (x0, x1), (y0, y1) = x_range, y_range
+    with np.errstate(invalid='ignore'):
+        inside = (points.real >= x0) & (points.real <= x1) & (points.imag >= y0) & (points.imag <= y1)
+    near = inside.copy()
+    near[1:] |= inside[:-1]
+    near[:-1] |= inside[1:]
+    clipped = np.where(near, points, np.nan)
+    gap = ~near
+    keep = ~gap
+    keep[1:] |= gap[1:] & ~gap[:-1]     # 끊김이 이어지면 첫 번째만
+    keep[0] = True
+    clipped = clipped[keep]
+    return clipped, points.size - clipped.size
+
+
+# ✅ 점 개수에 맞는 trace 종류 (많으면 WebGL)
+def scatter_class(n_points, threshold=WEBGL_THRESHOLD):
+    return go.Scattergl if n_points > threshold else go.Scatter
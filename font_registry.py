@@ -0,0 +1,69 @@
+import os
+import shutil
+import subprocess
+from functools import lru_cache
+
+# ✅ 한글 글꼴 등록부 — 프로세스당 한 번만 찾아 두고 모든 세션이 같은 결과를 씀
+#    Plotly(브라우저)와 정적 렌더러(matplotlib 등)에 같은 글꼴 이름을 넘겨 준다.
+#    전역 plt.rcParams를 바꾸지 않으므로 동시에 실행되는 세션끼리 서로 덮어쓰지 않음.
+#
+#        fig.update_layout(font=dict(family=plotly_font_family()))
+#        with plt.rc_context(matplotlib_rc()): ...
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# ✅ 저장소에 함께 두는 글꼴 (글꼴 이름, 파일 경로)
+BUNDLED_FONTS = [
+    ("NanumGothic", os.path.join(ROOT, "fonts", "나눔 글꼴", "나눔고딕", "NanumFontSetup_TTF_GOTHIC", "NanumGothic.ttf")),
+]
+DEFAULT_FAMILY = "NanumGothic"
+
+# ✅ 브라우저 쪽에 설치돼 있을 만한 한글 글꼴 (CSS font-family 순서대로)
+BROWSER_FALLBACKS = ["Nanum Gothic", "Malgun Gothic", "Apple SD Gothic Neo", "Noto Sans KR", "Noto Sans CJK KR",
+                     "sans-serif"]
+
+
+# ✅ 시스템에 설치된 한글 글꼴 하나 (fontconfig가 있을 때만) → (이름, 경로) 또는 None
+def _system_korean_font():
+    if shutil.which("fc-list") is None:
+        return None
+    try:
+        out = subprocess.run(["fc-list", ":lang=ko", "family", "file"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    for line in sorted(out.stdout.splitlines()):
+        path, _, family = line.partition(":")
+        if family.strip():
+            return family.split(",")[0].strip(), path.strip()
+    return None
+
+
+# ✅ 사용할 한글 글꼴 (이름, 파일 경로 또는 None) — 저장소 글꼴 → 시스템 글꼴 → 이름만
+@lru_cache(maxsize=1)
+def korean_font():
+    for family, path in BUNDLED_FONTS:
+        if os.path.exists(path):
+            return family, path
+    return _system_korean_font() or (DEFAULT_FAMILY, None)
+
+
+# ✅ Plotly용 font-family 문자열 (찾은 글꼴을 맨 앞에, 없으면 브라우저 글꼴로 넘어감)
+@lru_cache(maxsize=1)
+def plotly_font_family():
+    names = [korean_font()[0], DEFAULT_FAMILY] + BROWSER_FALLBACKS
+    return ", ".join(dict.fromkeys(names))
+
+
+# ✅ matplotlib 글꼴 파일 등록은 처음 한 번만 (matplotlib은 쓸 때만 불러옴)
+@lru_cache(maxsize=1)
+def _register_matplotlib_font():
+    family, path = korean_font()
+    if path is not None:
+        from matplotlib import font_manager
+        font_manager.fontManager.addfont(path)
+    return family
+
+
+# ✅ 정적 렌더러용 설정 — 전역으로 바꾸지 말고 plt.rc_context(matplotlib_rc()) 안에서만 사용
+def matplotlib_rc():
+    return {'font.family': _register_matplotlib_font(), 'axes.unicode_minus': False}
@@ -0,0 +1,522 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# ✅ 복소평면 자취 계산 엔진 (Streamlit 없이 사용 가능)
+#    F(x, y) = 0 인 곡선을 거친 격자 → 부호가 바뀌는 칸만 세분(마칭 스퀘어) 순서로 찾는다.
+
+DEFAULT_RESOLUTION = 800   # 최종(세분 후) 격자 한 변의 칸 수
+DEFAULT_REFINE = 8         # 거친 격자 한 칸을 몇 칸으로 세분할지
+DISCOVERY_RESOLUTION = 200 # 정의역 찾기용 거친 격자 한 변의 칸 수
+TILE_SIZE = 256            # 영역 계산 블록 한 변의 칸 수
+CELL_BATCH = 512           # 한 번에 세분할 거친 칸 수
+LEAF_SIZE = 16             # 구간 판정으로 더 나누지 않고 점별로 계산하는 블록 크기
+LEAF_BATCH = 256           # 한 번에 점별 계산할 잎 블록 수
+IMAG_ZERO = 1e-6           # 곡선 위 허수부가 tol의 이 비율 이하면 0으로 봄 (선으로 남김)
+
+# ✅ 블록 병렬 계산 스레드 수 (배포마다 LOCUS_WORKERS 환경변수로 조정, 1이면 순차 계산)
+#    numpy 연산은 GIL을 놓으므로 스레드 풀로 여러 코어를 쓰고, 풀은 프로세스 전체에서 공유
+WORKERS = max(1, int(os.environ.get('LOCUS_WORKERS', os.cpu_count() or 1)))
+_executor = None
+_executor_lock = threading.Lock()
+
+# 마칭 스퀘어 선분 표 (꼭짓점 v0=(좌하) v1=(우하) v2=(우상) v3=(좌상),
+#                    변 e0=아래 e1=오른쪽 e2=위 e3=왼쪽)
+_SEGMENT_TABLE = {
+    1: [(3, 0)], 2: [(0, 1)], 3: [(3, 1)], 4: [(1, 2)],
+    6: [(0, 2)], 7: [(3, 2)], 8: [(2, 3)], 9: [(0, 2)],
+    11: [(1, 2)], 12: [(1, 3)], 13: [(0, 1)], 14: [(0, 3)],
+}
+# 안장점(대각선 두 꼭짓점만 양수) → 칸 중심값의 부호로 연결 방향 결정
+_SADDLE_TABLE = {
+    (5, True): [(0, 1), (2, 3)], (5, False): [(3, 0), (1, 2)],
+    (10, True): [(3, 0), (1, 2)], (10, False): [(0, 1), (2, 3)],
+}
+
+
+# ✅ 계산 정밀도 ('double' = float64/complex128, 'single' = float32/complex64)
+def _real_dtype(precision):
+    return np.float32 if precision == 'single' else np.float64
+
+
+def _complex_dtype(precision):
+    return np.complex64 if precision == 'single' else np.complex128
+
+
+# ✅ 블록들을 병렬로 계산 (결과 순서는 입력 순서와 같음)
+def _map_tiles(func, items):
+    global _executor
+    items = list(items)
+    if WORKERS <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='locus')
+    return list(_executor.map(func, items))
+
+
+# ✅ 함수값 계산 (상수식도 격자 모양으로 맞춤, 복소수 결과는 그대로)
+def _evaluate_raw(func, X, Y):
+    with np.errstate(all='ignore'):
+        F = np.asarray(func(X, Y))
+    F = F.astype(np.result_type(F.dtype, np.float32), copy=False)
+    return np.broadcast_to(F, np.broadcast(X, Y).shape)
+
+
+# ✅ 부호 판정용 실수 함수값 — 복소수 결과(예: x + i*y == 1 + i)는 실수부로 곡선을 찾고
+#    허수부는 extract_contours가 곡선 위에서 따로 확인함 (_filter_imaginary)
+def _evaluate(func, X, Y):
+    F = _evaluate_raw(func, X, Y)
+    return F.real if np.iscomplexobj(F) else F
+
+
+# ✅ 부호가 바뀌는 거친 칸 찾기 (주변 한 칸까지 넓혀서 곡선 끊김 방지)
+def _sign_change_cells(F, dilate=True):
+    positive = F > 0
+    finite = np.isfinite(F)
+    corners_pos = [positive[:-1, :-1], positive[:-1, 1:], positive[1:, 1:], positive[1:, :-1]]
+    corners_ok = finite[:-1, :-1] & finite[:-1, 1:] & finite[1:, 1:] & finite[1:, :-1]
+    any_pos = corners_pos[0] | corners_pos[1] | corners_pos[2] | corners_pos[3]
+    all_pos = corners_pos[0] & corners_pos[1] & corners_pos[2] & corners_pos[3]
+    flagged = any_pos & ~all_pos & corners_ok
+    if not dilate:
+        return flagged
+
+    padded = np.pad(flagged, 1)
+    dilated = np.zeros_like(flagged)
+    rows, cols = flagged.shape
+    for di in range(3):
+        for dj in range(3):
+            dilated |= padded[di:di + rows, dj:dj + cols]
+    return dilated
+
+
+# ✅ 선분들을 변(edge) 키로 이어 붙여 순서 있는 폴리라인으로 만들기
+def _stitch(key_a, key_b, point_a, point_b, dtype=np.complex128):
+    points = {}
+    adjacency = {}
+    for s, (a, b, pa, pb) in enumerate(zip(key_a, key_b, point_a, point_b)):
+        points[a] = pa
+        points[b] = pb
+        adjacency.setdefault(a, []).append(s)
+        adjacency.setdefault(b, []).append(s)
+
+    used = [False] * len(key_a)
+
+    def extend(chain):
+        while True:
+            key = chain[-1]
+            nxt = next((s for s in adjacency[key] if not used[s]), None)
+            if nxt is None:
+                return
+            used[nxt] = True
+            chain.append(key_b[nxt] if key_a[nxt] == key else key_a[nxt])
+
+    polylines = []
+    for s in range(len(key_a)):
+        if used[s]:
+            continue
+        used[s] = True
+        chain = [key_a[s], key_b[s]]
+        extend(chain)
+        chain.reverse()
+        extend(chain)
+        polylines.append(np.array([points[k] for k in chain], dtype=dtype))
+    return polylines
+
+
+# ✅ F(x, y) = 0 인 곡선을 순서 있는 폴리라인(복소수 배열) 목록으로 반환
+#    precision='single' 이면 float32/complex64로 계산해 메모리를 절반으로 줄임
+def extract_contours(func, x_range, y_range, resolution=DEFAULT_RESOLUTION, refine=DEFAULT_REFINE,
+                     precision='double'):
+    dtype = _real_dtype(precision)
+    x0, x1 = x_range
+    y0, y1 = y_range
+    cells = max(resolution // refine, 2)
+    hx = (x1 - x0) / (cells * refine)
+    hy = (y1 - y0) / (cells * refine)
+
+    # 1) 거친 격자
+    gi = np.arange(cells + 1) * refine
+    coarse_X, coarse_Y = np.meshgrid((x0 + gi * hx).astype(dtype), (y0 + gi * hy).astype(dtype))
+    coarse_F = _evaluate(func, coarse_X, coarse_Y)
+    flagged = _sign_change_cells(coarse_F)
+    ci, cj = np.nonzero(flagged)
+
+    grid = (x0, y0, hx, hy, cells * refine + 1, dtype)
+    # 세분 격자에서 0으로 볼 잔차 (예전 |L - R| < eps 기준과 같은 값)
+    tol = 2 * max(abs(hx), abs(hy))
+
+    if ci.size == 0:
+        # 부호 변화 없이 0에 닿기만 하는 경우 (예: (y - x)**2 == 0) → 세분 격자의 점으로만
+        #   x**2 == -1 처럼 0에 닿지 않는 식은 빈 목록 (자취 없음)
+        return _touching_points(func, coarse_X, coarse_Y, refine, grid, tol, precision)
+
+    # 2) 표시된 칸만 일정 개수씩 나눠 세분 (메모리 상한 유지)
+    batches = _map_tiles(lambda k: _march_cells(func, ci[k:k + CELL_BATCH], cj[k:k + CELL_BATCH], refine, grid),
+                         range(0, ci.size, CELL_BATCH))
+    key_a, key_b, point_a, point_b = (np.concatenate(parts) for parts in zip(*batches))
+    polylines = _stitch(key_a.tolist(), key_b.tolist(), point_a.tolist(), point_b.tolist(),
+                        dtype=_complex_dtype(precision))
+    polylines = _filter_imaginary(func, polylines, tol, dtype)
+    return _collapse_short(polylines, 2 * tol)
+
+
+# ✅ 복소수 잔차는 실수부·허수부가 모두 0이어야 함 → 실수부 곡선 위에서
+#    허수부가 (반올림 오차 수준으로) 0인 구간은 선으로, |허수부| <= tol 인 구간의 극소점과
+#    허수부 부호가 바뀌는 곳(보간)은 점 하나씩으로 남김
+def _filter_imaginary(func, polylines, tol, dtype):
+    if not polylines:
+        return polylines
+    Z = np.concatenate(polylines)
+    F = _evaluate_raw(func, Z.real.astype(dtype), Z.imag.astype(dtype))
+    if not np.iscomplexobj(F):
+        return polylines
+    G = F.imag
+    kept = []
+    start = 0
+    for line in polylines:
+        g = G[start:start + line.size]
+        start += line.size
+        keep = np.abs(g) <= tol
+        edges = np.flatnonzero(np.diff(np.concatenate([[0], keep.astype(np.int8), [0]])))
+        for a, b in zip(edges[::2], edges[1::2]):
+            run, size = line[a:b], np.abs(g[a:b])
+            if size.max() <= tol * IMAG_ZERO:
+                kept.append(run)
+                continue
+            left = np.concatenate([[np.inf], size[:-1]])
+            right = np.concatenate([size[1:], [np.inf]])
+            kept += [run[[m]] for m in np.flatnonzero((size <= left) & (size < right))]
+
+        with np.errstate(all='ignore'):
+            cross = np.flatnonzero(~keep[:-1] & ~keep[1:] & (np.sign(g[:-1]) * np.sign(g[1:]) < 0))
+            t = g[cross] / (g[cross] - g[cross + 1])
+        points = line[cross] + t * (line[cross + 1] - line[cross])
+        if points.size:
+            # 극(예: 1/(y - 1))을 지나며 바뀐 부호는 버림
+            g_mid = _evaluate_raw(func, points.real.astype(dtype), points.imag.astype(dtype)).imag
+            ok = ~(np.abs(g_mid) > 0.5 * np.maximum(np.abs(g[cross]), np.abs(g[cross + 1])))
+            kept += [np.array([p], dtype=line.dtype) for p in points[ok]]
+    return kept
+
+
+# ✅ 길이가 거의 0인 폴리라인은 점 하나로 (그림에서 선이 아니라 점으로 보이도록)
+def _collapse_short(polylines, min_length):
+    out = []
+    for line in polylines:
+        if line.size > 1 and max(np.ptp(line.real), np.ptp(line.imag)) < min_length:
+            line = np.array([line.mean()], dtype=line.dtype)
+        out.append(line)
+    return out
+
+
+# ✅ 0에 닿기만 하는 식: |F|가 작은 거친 격자점 주변 칸만 세분해서,
+#    세분 격자에서 |F| <= tol 이고 이웃보다 작은(극소) 점만 남김 → 점 하나씩의 목록
+def _touching_points(func, coarse_X, coarse_Y, refine, grid, tol, precision):
+    x0, y0, hx, hy, row, dtype = grid
+    coarse_abs = np.abs(_evaluate_raw(func, coarse_X, coarse_Y))
+    near = np.isfinite(coarse_abs) & (coarse_abs < tol * refine)
+    near_cells = near[:-1, :-1] | near[:-1, 1:] | near[1:, 1:] | near[1:, :-1]
+    ci, cj = np.nonzero(near_cells)
+
+    def refine_cells(k):
+        # 칸 둘레 한 줄씩 더 계산해서 칸 경계의 점도 실제 이웃과 비교
+        sub = np.arange(-1, refine + 2)
+        node_i = ci[k:k + CELL_BATCH, None, None] * refine + sub[None, :, None]
+        node_j = cj[k:k + CELL_BATCH, None, None] * refine + sub[None, None, :]
+        A = np.abs(_evaluate_raw(func, (x0 + node_j * hx).astype(dtype), (y0 + node_i * hy).astype(dtype)))
+        A = np.where(np.isfinite(A), A, np.inf)
+        center = A[:, 1:-1, 1:-1]
+        minimum = ((center <= tol) & (center <= A[:, :-2, 1:-1]) & (center <= A[:, 2:, 1:-1])
+                   & (center <= A[:, 1:-1, :-2]) & (center <= A[:, 1:-1, 2:]))
+        inside = (node_i[:, 1:-1, :] >= 0) & (node_i[:, 1:-1, :] < row) & (node_j[:, :, 1:-1] >= 0) \
+            & (node_j[:, :, 1:-1] < row)
+        minimum &= inside
+        return (np.broadcast_to(node_i[:, 1:-1, :], center.shape)[minimum] * row
+                + np.broadcast_to(node_j[:, :, 1:-1], center.shape)[minimum])
+
+    keys = np.unique(np.concatenate([np.empty(0, dtype=np.intp)]
+                                    + _map_tiles(refine_cells, range(0, ci.size, CELL_BATCH))))
+    Z = (x0 + (keys % row) * hx) + 1j * (y0 + (keys // row) * hy)
+    return [np.array([z], dtype=_complex_dtype(precision)) for z in Z]
+
+
+# ✅ 거친 칸 묶음을 세분해 마칭 스퀘어 → 선분 (양 끝 변 키, 양 끝 좌표)
+def _march_cells(func, ci, cj, refine, grid):
+    x0, y0, hx, hy, row, dtype = grid
+    sub = np.arange(refine + 1)
+    node_i = ci[:, None, None] * refine + sub[None, :, None]     # y 방향 전역 인덱스
+    node_j = cj[:, None, None] * refine + sub[None, None, :]     # x 방향 전역 인덱스
+    X = (x0 + node_j * hx).astype(dtype)
+    Y = (y0 + node_i * hy).astype(dtype)
+    F = _evaluate(func, X, Y)
+
+    # 세분 칸 단위로 평탄화
+    f0 = F[:, :-1, :-1].ravel()
+    f1 = F[:, :-1, 1:].ravel()
+    f2 = F[:, 1:, 1:].ravel()
+    f3 = F[:, 1:, :-1].ravel()
+    cell_i = np.broadcast_to(node_i[:, :-1, :], (ci.size, refine, refine)).ravel()
+    cell_j = np.broadcast_to(node_j[:, :, :-1], (ci.size, refine, refine)).ravel()
+    del X, Y, F
+
+    case = ((f0 > 0).astype(np.int8) | ((f1 > 0) << 1) | ((f2 > 0) << 2) | ((f3 > 0) << 3))
+    finite = np.isfinite(f0) & np.isfinite(f1) & np.isfinite(f2) & np.isfinite(f3)
+    active = finite & (case != 0) & (case != 15)
+    f0, f1, f2, f3 = f0[active], f1[active], f2[active], f3[active]
+    cell_i, cell_j, case = cell_i[active], cell_j[active], case[active]
+
+    with np.errstate(all='ignore'):
+        t0 = f0 / (f0 - f1)
+        t1 = f1 / (f1 - f2)
+        t2 = f3 / (f3 - f2)
+        t3 = f0 / (f0 - f3)
+        bx = x0 + cell_j * hx
+        by = y0 + cell_i * hy
+        edge_point = np.stack([
+            (bx + t0 * hx) + 1j * by,
+            (bx + hx) + 1j * (by + t1 * hy),
+            (bx + t2 * hx) + 1j * (by + hy),
+            bx + 1j * (by + t3 * hy),
+        ], axis=1)
+    edge_scale = np.stack([
+        np.maximum(np.abs(f0), np.abs(f1)),
+        np.maximum(np.abs(f1), np.abs(f2)),
+        np.maximum(np.abs(f3), np.abs(f2)),
+        np.maximum(np.abs(f0), np.abs(f3)),
+    ], axis=1)
+    vertical_offset = row * row
+    edge_key = np.stack([
+        cell_i * row + cell_j,
+        vertical_offset + cell_i * row + cell_j + 1,
+        (cell_i + 1) * row + cell_j,
+        vertical_offset + cell_i * row + cell_j,
+    ], axis=1)
+
+    center_pos = (f0 + f1 + f2 + f3) > 0
+    seg_cell, seg_a, seg_b = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+    for value, pairs in _SEGMENT_TABLE.items():
+        idx = np.nonzero(case == value)[0]
+        for a, b in pairs:
+            seg_cell.append(idx)
+            seg_a.append(np.full(idx.size, a))
+            seg_b.append(np.full(idx.size, b))
+    for (value, center), pairs in _SADDLE_TABLE.items():
+        idx = np.nonzero((case == value) & (center_pos == center))[0]
+        for a, b in pairs:
+            seg_cell.append(idx)
+            seg_a.append(np.full(idx.size, a))
+            seg_b.append(np.full(idx.size, b))
+    seg_cell = np.concatenate(seg_cell)
+    seg_a = np.concatenate(seg_a)
+    seg_b = np.concatenate(seg_b)
+    order = np.argsort(seg_cell, kind='stable')
+    seg_cell, seg_a, seg_b = seg_cell[order], seg_a[order], seg_b[order]
+
+    point_a = edge_point[seg_cell, seg_a]
+    point_b = edge_point[seg_cell, seg_b]
+
+    # 극(예: 1/x == y)에서 생기는 가짜 부호 변화 제거
+    ends = np.concatenate([point_a, point_b])
+    residual = np.abs(_evaluate(func, ends.real.astype(dtype), ends.imag.astype(dtype)))
+    scale = np.concatenate([edge_scale[seg_cell, seg_a], edge_scale[seg_cell, seg_b]])
+    ok = ~(residual > 0.5 * scale)
+    ok = ok[:seg_cell.size] & ok[seg_cell.size:]
+
+    return (edge_key[seg_cell, seg_a][ok], edge_key[seg_cell, seg_b][ok], point_a[ok], point_b[ok])
+
+
+# ✅ 조건식(부등식 영역)을 tile×tile 블록 단위로 계산해 조건을 만족하는 점만 모음
+#    블록 하나 크기만큼만 임시 배열을 쓰므로 해상도가 커져도 최대 메모리가 거의 일정함
+def evaluate_region(func, x_range, y_range, resolution, tile=TILE_SIZE, precision='double'):
+    dtype = _real_dtype(precision)
+    x = np.linspace(*x_range, resolution).astype(dtype)
+    y = np.linspace(*y_range, resolution).astype(dtype)
+
+    def region_tile(origin):
+        r0, c0 = origin
+        y_block = y[r0:r0 + tile, None]
+        x_block = x[None, c0:c0 + tile]
+        with np.errstate(all='ignore'):
+            mask = np.asarray(func(x_block, y_block), dtype=bool)
+        mask = np.broadcast_to(mask, (y_block.shape[0], x_block.shape[1]))
+        rows, cols = np.nonzero(mask)
+        return x[c0 + cols] + 1j * y[r0 + rows]
+
+    origins = [(r0, c0) for r0 in range(0, resolution, tile) for c0 in range(0, resolution, tile)]
+    parts = [np.empty(0, dtype=_complex_dtype(precision))] + _map_tiles(region_tile, origins)
+    return np.concatenate(parts)
+
+
+# ✅ 구간 연산 가지치기로 부등식 영역 계산
+#    classify(x_lo, x_hi, y_lo, y_hi) → (전부 참, 전부 거짓) 으로 블록 전체를 판정하고
+#    경계가 지나가는 '섞인' 블록만 4등분 → 잎 크기에서만 점별 계산 (일의 양이 둘레에 비례)
+def evaluate_region_pruned(func, classify, x_range, y_range, resolution, tile=TILE_SIZE,
+                           leaf=LEAF_SIZE, precision='double'):
+    dtype = _real_dtype(precision)
+    x = np.linspace(*x_range, resolution).astype(dtype)
+    y = np.linspace(*y_range, resolution).astype(dtype)
+    N = resolution
+
+    starts = np.arange(0, N, tile)
+    r0s, c0s = (a.ravel() for a in np.meshgrid(starts, starts, indexing='ij'))
+    size = tile
+    parts = [np.empty(0, dtype=_complex_dtype(precision))]
+    while r0s.size:
+        r1s = np.minimum(r0s + size, N) - 1
+        c1s = np.minimum(c0s + size, N) - 1
+        is_true, is_false = classify(x[c0s], x[c1s], y[r0s], y[r1s])
+        inside = np.asarray(is_true, dtype=bool)
+        mixed = ~(inside | np.asarray(is_false, dtype=bool))
+        if inside.any():
+            parts.append(_block_points(x, y, r0s[inside], c0s[inside], size))
+        r0s, c0s = r0s[mixed], c0s[mixed]
+        if size <= leaf:
+            break
+        half = (size + 1) // 2
+        r0s = np.concatenate([r0s, r0s, r0s + half, r0s + half])
+        c0s = np.concatenate([c0s, c0s + half, c0s, c0s + half])
+        keep = (r0s < N) & (c0s < N)
+        r0s, c0s = r0s[keep], c0s[keep]
+        size = half
+
+    # 잎 블록: 여러 개를 한 배열로 묶어 점별 계산
+    def leaf_batch(k):
+        return _block_points(x, y, r0s[k:k + LEAF_BATCH], c0s[k:k + LEAF_BATCH], size, func)
+
+    parts += _map_tiles(leaf_batch, range(0, r0s.size, LEAF_BATCH))
+    return np.concatenate(parts)
+
+
+# ✅ 같은 크기 블록들의 격자점 (func가 있으면 조건을 만족하는 점만)
+def _block_points(x, y, r0s, c0s, size, func=None):
+    offset = np.arange(size)
+    rows = r0s[:, None] + offset
+    cols = c0s[:, None] + offset
+    valid_rows, valid_cols = rows < y.size, cols < x.size
+    Xb = x[np.minimum(cols, x.size - 1)][:, None, :]
+    Yb = y[np.minimum(rows, y.size - 1)][:, :, None]
+    Z = Xb + 1j * Yb
+    if func is None and valid_rows.all() and valid_cols.all():
+        return Z.ravel()
+    valid = valid_rows[:, :, None] & valid_cols[:, None, :]
+    if func is not None:
+        with np.errstate(all='ignore'):
+            valid &= np.asarray(func(Xb, Yb), dtype=bool)
+    return Z[valid]
+
+
+# ✅ 정의역 찾기: 가장 넓은 후보 창을 거친 격자로 한 번만 훑어
+#    자취 전체를 담는 가장 작은 반지름을 고른다. 자취가 안 보이면 None.
+def discover_range(func, candidates, is_equation, resolution=DISCOVERY_RESOLUTION):
+    widest = max(candidates)
+    t = np.linspace(-widest, widest, resolution + 1)
+    X, Y = np.meshgrid(t, t)
+    F = _evaluate(func, X, Y)
+    spacing = t[1] - t[0]
+
+    if is_equation:
+        cells = _sign_change_cells(F, dilate=False)
+        if cells.any():
+            xs = X[:-1, :-1][cells] + spacing / 2
+            ys = Y[:-1, :-1][cells] + spacing / 2
+        else:
+            near = np.isfinite(F) & (np.abs(F) < 2 * spacing)
+            xs, ys = X[near], Y[near]
+    else:
+        inside = F != 0
+        xs, ys = X[inside], Y[inside]
+    if xs.size == 0:
+        return None
+
+    radius = np.maximum(np.abs(xs), np.abs(ys))
+    extent = radius.max() + spacing
+    if extent >= widest:
+        # 창 밖으로 뻗는 자취(포물선 등)는 일부가 보이는 가장 작은 반지름
+        extent = radius.min() + spacing
+    for range_size in sorted(candidates):
+        if range_size >= extent:
+            return range_size
+    return widest
+
+
+# ✅ NaN으로 구분된 배열에서 양옆이 끊긴 외딴 점 → (선 부분, 외딴 점들)
+#    점만 있는 자취(예: x**2 + y**2 == 0)는 선으로 그리면 보이지 않으므로 마커로 따로 그림
+def split_isolated(Z):
+    finite = np.isfinite(Z)
+    linked = np.zeros_like(finite)
+    linked[1:] |= finite[:-1]
+    linked[:-1] |= finite[1:]
+    isolated = finite & ~linked
+    return np.where(isolated, np.nan, Z), Z[isolated]
+
+
+# ✅ 폴리라인 목록 → NaN으로 구분된 하나의 복소수 배열 (Plotly 선 끊김 표시용)
+def join_polylines(polylines):
+    if not polylines:
+        return np.empty(0, dtype=complex)
+    gap = np.array([np.nan + 1j * np.nan], dtype=polylines[0].dtype)
+    parts = []
+    for line in polylines:
+        parts.append(line)
+        parts.append(gap)
+    return np.concatenate(parts[:-1])
+
+
+# ✅ 자취 결과 캐시 (메모리 상한 + LRU 제거 + 적중/누락 횟수)
+#    Streamlit 세션들이 한 프로세스의 메모리를 같이 쓰므로 바이트 상한을 반드시 지킨다.
+class LocusCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _sizeof(value):
+        return sum(getattr(v, 'nbytes', 64) for v in value) + 64
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        # 배열은 읽기 전용으로 저장해 세션 사이에서 실수로 수정되지 않게 함
+        for v in value:
+            if isinstance(v, np.ndarray):
+                v.flags.writeable = False
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self._entries), 'bytes': self.current_bytes,
+                    'max_bytes': self.max_bytes}
@@ -0,0 +1,36 @@
+import os
+
+import numpy as np
+import streamlit.components.v1 as components
+
+# ✅ 섹션 1 브라우저 계산 모드 컴포넌트 (components/matrix_transform/index.html)
+#    Plotly 그림과 변환 전 점을 한 번 보내 두면, 행렬을 움직이는 동안은 브라우저가 직접 곱해서 그리고
+#    슬라이더에서 손을 뗄 때만 최종 행렬이 Python으로 돌아온다.
+
+_COMPONENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "matrix_transform")
+_matrix_transform = components.declare_component("matrix_transform", path=_COMPONENT_DIR)
+
+
+# ✅ NaN(끊김)은 JSON에 없으므로 null로
+def _json_list(values):
+    values = np.asarray(values, dtype=float).astype(object)
+    values[np.isnan(values.astype(float))] = None
+    return values.tolist()
+
+
+# ✅ sources: {trace 번호: (N, 2) 점} — 브라우저에서 trace 점 = matrix · 점
+#    hidden: 행렬을 움직이는 동안 숨길 trace 번호 (궤도처럼 Python에서 다시 계산해야 하는 것)
+#    반환: 마지막으로 보낸 2×2 행렬 (list) 또는 아직 움직이지 않았으면 None
+def matrix_transform(fig, sources, matrix, hidden=(), limit=5.0, step=0.1, key=None, on_change=None):
+    return _matrix_transform(
+        figure=fig.to_json(),
+        sources=[{"trace": int(trace), "x": _json_list(np.asarray(xy)[:, 0]), "y": _json_list(np.asarray(xy)[:, 1])}
+                 for trace, xy in sources.items()],
+        matrix=np.asarray(matrix, dtype=float).tolist(),
+        hidden=[int(trace) for trace in hidden],
+        limit=limit,
+        step=step,
+        key=key,
+        default=None,
+        on_change=on_change,
+    )
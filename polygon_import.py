@@ -0,0 +1,229 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from transform_core import pack_shapes
+
+# ✅ 큰 외곽선 불러오기 (CSV / GeoJSON / .npy) — Streamlit 없이 사용 가능
+#    모든 꼭짓점을 float64 (N, 2) 배열 하나에 모으고, 고리(ring)마다 시작 위치를 offsets에 기록한다.
+#    고리 k의 꼭짓점 = vertices[offsets[k]:offsets[k + 1]]  (transform_core.pack_shapes와 같은 형식)
+#
+#    CSV는 CSV_CHUNK_LINES 줄씩 나눠 변환하고, GeoJSON은 json.loads로 한 번에 읽는다 (스트리밍 아님).
+#
+#    한 번 읽은 파일은 IMPORT_DIR에 .npy로 저장해 두고, 다음 실행부터는 다시 읽지 않고 메모리 맵으로 연다.
+#    저장된 파일 전체가 IMPORT_MAX_BYTES를 넘으면 가장 오래 쓰이지 않은 것부터 지운다.
+#        vertices, offsets = load_polygons(uploaded.getvalue(), uploaded.name)
+
+IMPORT_DIR = os.environ.get("SHAPE_IMPORT_DIR", os.path.join(tempfile.gettempdir(), "shape_lab_imports"))
+IMPORT_MAX_BYTES = int(os.environ.get("SHAPE_IMPORT_MAX_BYTES", 512 * 1024 * 1024))
+CSV_CHUNK_LINES = 100_000     # CSV는 이 줄 수만큼씩 모아서 한 번에 숫자로 변환
+SUPPORTED_TYPES = ["csv", "txt", "geojson", "json", "npy"]
+
+
+# ✅ 고리 시작 위치 목록 → offsets (빈 고리는 없앰)
+def _offsets(breaks, count):
+    return np.unique(np.concatenate([[0], breaks, [count]]).astype(np.int64))
+
+
+# ✅ NaN이 들어간 행은 고리 구분선으로 보고 빼냄
+def _split_nan_rows(vertices, offsets):
+    gap = np.isnan(vertices).any(axis=1)
+    if not gap.any():
+        return vertices, offsets
+    kept_before = np.concatenate([[0], np.cumsum(~gap)])     # i번 행 앞까지 남은 꼭짓점 수
+    breaks = kept_before[np.concatenate([offsets, np.nonzero(gap)[0] + 1])]
+    vertices = vertices[~gap]
+    return vertices, _offsets(breaks, len(vertices))
+
+
+# ✅ CSV: 한 줄에 "x,y" (세미콜론·탭·공백 구분도 가능, 세 번째 열부터는 무시)
+#    빈 줄이나 "nan,nan" 줄이 나오면 새 고리 시작, 첫 줄이 숫자가 아니면 머리글로 보고 건너뜀
+def _read_csv(data):
+    stream = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig")
+    chunks, pending, breaks = [], [], []
+    count = 0
+    delimiter = None
+    first = True
+
+    def flush():
+        nonlocal count
+        if pending:
+            block = np.loadtxt(pending, delimiter=delimiter, usecols=(0, 1), dtype=np.float64, ndmin=2)
+            chunks.append(block)
+            count += len(block)
+            pending.clear()
+
+    for line in stream:
+        text = line.strip()
+        if not text:
+            flush()
+            breaks.append(count)
+            continue
+        text = text.replace(";", ",").replace("\t", ",")
+        if first:
+            first = False
+            delimiter = "," if "," in text else None
+            try:
+                float(text.split(delimiter)[0])
+            except ValueError:
+                continue
+        pending.append(text)
+        if len(pending) >= CSV_CHUNK_LINES:
+            flush()
+    flush()
+
+    vertices = np.concatenate(chunks) if chunks else np.empty((0, 2))
+    return _split_nan_rows(vertices, _offsets(breaks, count))
+
+
+# ✅ GeoJSON: Polygon / MultiPolygon의 모든 고리, LineString / MultiLineString의 각 선 (점은 무시)
+#    구조가 어긋난 파일(객체가 아닌 노드, 목록이 아닌 좌표)은 ValueError로 알림
+def _collect_rings(node, rings):
+    if not isinstance(node, dict):
+        raise ValueError(f"GeoJSON 객체가 아닙니다: {type(node).__name__}")
+    kind = node.get("type")
+    if kind == "FeatureCollection":
+        for feature in _as_list(node.get("features", []), kind):
+            _collect_rings(feature, rings)
+    elif kind == "Feature":
+        if node.get("geometry"):
+            _collect_rings(node["geometry"], rings)
+    elif kind == "GeometryCollection":
+        for geometry in _as_list(node.get("geometries", []), kind):
+            _collect_rings(geometry, rings)
+    elif kind == "Polygon" or kind == "MultiLineString":
+        rings.extend(_as_list(node.get("coordinates"), kind))
+    elif kind == "MultiPolygon":
+        for polygon in _as_list(node.get("coordinates"), kind):
+            rings.extend(_as_list(polygon, kind))
+    elif kind == "LineString":
+        rings.append(node.get("coordinates"))
+
+
+def _as_list(value, kind):
+    if not isinstance(value, list):
+        raise ValueError(f"{kind}의 좌표·항목은 목록이어야 합니다.")
+    return value
+
+
+# ✅ 고리 하나 → (n, 2) 배열 (좌표마다 숫자가 2개 이상이어야 함)
+def _ring_array(ring):
+    try:
+        array = np.asarray(ring, dtype=np.float64)
+    except (ValueError, TypeError):
+        array = None
+    if array is None or array.ndim != 2 or array.shape[1] < 2:
+        raise ValueError("GeoJSON 고리는 [x, y] 좌표들의 목록이어야 합니다.")
+    return array[:, :2]
+
+
+def _read_geojson(data):
+    rings = []
+    _collect_rings(json.loads(data), rings)
+    return pack_shapes([_ring_array(ring) for ring in rings if not isinstance(ring, list) or len(ring)])
+
+
+# ✅ .npy: (N, 2) 이상 배열 하나, NaN 행은 고리 구분선
+def _read_npy(data):
+    array = np.load(io.BytesIO(data), allow_pickle=False)
+    if array.ndim != 2 or array.shape[1] < 2:
+        raise ValueError(f".npy 배열 모양은 (N, 2)여야 합니다: {array.shape}")
+    vertices = np.ascontiguousarray(array[:, :2], dtype=np.float64)
+    return _split_nan_rows(vertices, _offsets([], len(vertices)))
+
+
+# ✅ 파일 내용 → (vertices, offsets)  (확장자로 형식 판단)
+def parse_polygons(data, filename):
+    ext = os.path.splitext(filename)[1].lower().lstrip(".")
+    if ext in ("geojson", "json"):
+        vertices, offsets = _read_geojson(data)
+    elif ext == "npy":
+        vertices, offsets = _read_npy(data)
+    elif ext in ("csv", "txt"):
+        vertices, offsets = _read_csv(data)
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: .{ext}")
+    if len(vertices) == 0:
+        raise ValueError("꼭짓점이 하나도 없습니다.")
+    return vertices, offsets
+
+
+# ✅ 다른 세션(스레드·프로세스)이 같은 파일을 동시에 저장해도 깨진 파일이 보이지 않도록
+#    저장마다 따로 만든 임시 파일에 쓰고 이름 바꾸기
+def _save_atomic(path, array):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# ✅ 저장된 파일 전체 크기가 max_bytes를 넘으면 가장 오래 쓰이지 않은 파일(해시 단위)부터 지움
+#    keep 해시는 방금 저장한 것이므로 남김. 다른 세션이 먼저 지웠거나 지울 수 없으면 넘어감
+#    다 쓴 .npy만 셈 — .tmp는 다른 세션이 아직 쓰고 있는 파일
+def _prune(directory, max_bytes, keep):
+    groups = {}
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(".npy"):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        key = entry.name.split(".")[0]
+        used, size, paths = groups.get(key, (0, 0, []))
+        groups[key] = (max(used, stat.st_mtime), size + stat.st_size, paths + [entry.path])
+    total = sum(size for _, size, _ in groups.values())
+    for key, (_, size, paths) in sorted(groups.items(), key=lambda item: item[1][0]):
+        if total <= max_bytes:
+            break
+        if key == keep:
+            continue
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+
+
+# ✅ 파일 내용의 해시로 저장된 .npy를 찾고, 없을 때만 읽어서 저장 → (vertices, offsets)
+#    저장된 것은 메모리 맵으로 열고 수정 시각을 갱신 (정리할 때 최근에 쓴 것으로 보이게)
+def load_polygons(data, filename, directory=None):
+    directory = directory or IMPORT_DIR
+    ext = os.path.splitext(filename)[1].lower()
+    key = hashlib.sha1(ext.encode() + data).hexdigest()
+    vertices_path = os.path.join(directory, key + ".vertices.npy")
+    offsets_path = os.path.join(directory, key + ".offsets.npy")
+    try:
+        os.utime(vertices_path)
+        return np.load(vertices_path, mmap_mode="r"), np.load(offsets_path)
+    except FileNotFoundError:
+        pass     # 처음 보는 파일이거나 정리되어 지워진 파일
+
+    vertices, offsets = parse_polygons(data, filename)
+    vertices.flags.writeable = False     # 메모리 맵으로 열 때와 같이 읽기 전용
+    os.makedirs(directory, exist_ok=True)
+    _save_atomic(offsets_path, offsets)
+    _save_atomic(vertices_path, vertices)
+    _prune(directory, IMPORT_MAX_BYTES, keep=key)
+    return vertices, offsets
+
+
+# ✅ 고리 사이에 NaN 행을 끼운 (N + 고리 수 - 1, 2) 배열 (Plotly trace 하나로 그리기)
+def join_rings(vertices, offsets):
+    lengths = np.diff(offsets)
+    ring = np.repeat(np.arange(len(lengths)), lengths)
+    out = np.full((len(vertices) + len(lengths) - 1, 2), np.nan)
+    out[np.arange(len(vertices)) + ring] = vertices
+    return out
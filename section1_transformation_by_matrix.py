@@ -1,163 +1,319 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import os
+from functools import lru_cache
 import plotly.graph_objects as go
+from transform_core import (transform_shape, batch_transform, matrix_powers, join_with_gaps,
+                            circle_conic, transform_conic, conic_bounds, conic_sample_count, sample_conic,
+                            line_parametric, transform_line, clip_line)
+from figure_utils import clip_polyline, decimate_polyline, scatter_class
+from polygon_import import SUPPORTED_TYPES, load_polygons, join_rings
+from matrix_component import matrix_transform
+from font_registry import plotly_font_family
 
+FIGURE_SIZE = 600
+LINE_MIN_HALF_RANGE = 5          # 직선은 끝이 없으므로 화면 반폭을 최소 이만큼
+ORBIT_SAMPLE_BUDGET = 400_000    # 원·불러온 도형 궤도 전체에 찍을 점 수 상한 (K가 크면 도형 하나당 점을 줄임)
+IMPORTED = "파일에서 불러오기"      # CSV / GeoJSON / .npy 외곽선 (vertices, offsets)
+CLIENT_LINE_REACH = 50           # 브라우저 계산 모드에서 직선은 화면 크기의 이 배수만큼 길게 보냄
+MATRIX_ENTRIES = {"a11": (0, 0), "a12": (0, 1), "a21": (1, 0), "a22": (1, 1)}
 
-def run_transformation_by_matrix():
-    st.header("🟩 (1) 행렬을 통한 일차변환 시뮬레이터")
-    st.markdown("여러 도형을 여러 행렬로 일차변환하는 실험을 해 보세요.")
 
+# ✅ 숫자 포맷 함수
+def format_number(n):
+    return f"{n:.1f}".rstrip('0').rstrip('.') if n % 1 != 0 else str(int(n))
 
 
-    # ✅ 페이지 설정
-    #st.set_page_config(page_title="도형 변환 실험실", layout="wide")
-    #st.title("🔄 도형 변환 실험실")
+# ✅ "x,y" 문자열 → 점 (같은 문자열은 다시 해석하지 않음)
+@lru_cache(maxsize=256)
+def parse_point(text):
+    parts = text.split(',')
+    if len(parts) != 2:
+        raise ValueError(f"'{text}' — 좌표는 x,y 형태로 입력하세요.")
+    return float(parts[0]), float(parts[1])
+
+
+# ✅ 직선 위의 강조할 점 (y절편, 없으면 x절편)
+def line_base_point(a, b, c):
+    if b != 0:
+        return np.array([0, c / b])
+    return np.array([c / a, 0])
 
-    # ✅ 한글 폰트 설정
-    font_path = './fonts/나눔 글꼴/나눔고딕/NanumFontSetup_TTF_GOTHIC/NanumGothic.ttf'
-    font_prop = None
-    if os.path.exists(font_path):
-        font_prop = fm.FontProperties(fname=font_path)
-        plt.rcParams['font.family'] = font_prop.get_name()
-        plt.rcParams['axes.unicode_minus'] = False
 
-    # ✅ 숫자 포맷 함수
-    def format_number(n):
-        return f"{n:.1f}".rstrip('0').rstrip('.') if n % 1 != 0 else str(int(n))
+# ✅ 축 범위: 원은 타원을 감싸는 상자, 직선은 원점에서 가장 가까운 점과 강조점으로 계산
+#    불러온 도형은 실제 좌표 크기(경위도 등)가 다양하므로 최대 20 제한을 두지 않음
+def view_range(shape_type, shape, transformed, marked_points=()):
+    if shape_type == IMPORTED:
+        extent = np.array([shape[0].min(axis=0), shape[0].max(axis=0),
+                           transformed[0].min(axis=0), transformed[0].max(axis=0)])
+    elif shape_type == "원":
+        extent = np.array([*conic_bounds(*shape), *conic_bounds(*transformed)])
+    elif shape_type == "직선":
+        kind, image = transformed
+        foot = line_parametric(*image)[0] if kind == 'line' else image
+        extent = np.array([[0, 0], line_parametric(*shape)[0], foot, *marked_points])
+    else:
+        extent = np.concatenate([shape, transformed])
+    x_center, y_center = extent.mean(axis=0)
+    half_range = np.ptp(extent, axis=0).max() * 0.75
+    if shape_type != IMPORTED:
+        half_range = min(half_range, 20)  # 최대 20으로 제한
+    if shape_type == "직선":
+        half_range = max(half_range, LINE_MIN_HALF_RANGE)
+    if half_range < 1 and shape_type != IMPORTED:
+        half_range = 2
+    if half_range == 0:
+        half_range = 1
+    return [x_center - half_range, x_center + half_range], [y_center - half_range, y_center + half_range]
+
+
+# ✅ 정확한 표현(타원·직선 계수) → 화면 범위에 맞춘 점 (원은 화면 둘레 픽셀에 맞춘 개수, 직선은 화면 안 양 끝점 두 개)
+#    불러온 도형은 고리를 NaN으로 이어 붙인 뒤 화면 해상도로 솎아냄
+def draw_points(shape_type, shape, x_view, y_view, n_samples=None):
+    if shape_type == IMPORTED:
+        path = join_rings(*shape).view(np.complex128).ravel()
+        path, _ = decimate_polyline(path, x_view, y_view, FIGURE_SIZE, FIGURE_SIZE)
+        return np.column_stack([path.real, path.imag])
+    if shape_type == "원":
+        return sample_conic(*shape, n_samples)
+    if shape_type == "직선":
+        kind, value = shape
+        if kind == 'point':
+            return value[None, :]
+        return clip_line(*line_parametric(*value), x_view, y_view)
+    return shape
+
+
+# ✅ 궤도 A·S, …, Aᴷ·S 를 (K, 점 수, 2)로 — 원은 (중심, 모양 행렬)을, 직선은 (점, 방향)을 거듭제곱으로 한꺼번에 옮김
+def orbit_points(shape_type, shape, powers, x_view, y_view):
+    with np.errstate(over='ignore', invalid='ignore'):
+        if shape_type == "원":
+            centers, shapes = transform_conic(*shape, powers)
+            n = conic_sample_count(shape[1], x_view, FIGURE_SIZE)
+            n = max(min(n, ORBIT_SAMPLE_BUDGET // len(powers)), 16)
+            return sample_conic(centers, shapes, n)
+        if shape_type == "직선":
+            p0, d = line_parametric(*shape)
+            return clip_line(powers @ p0, powers @ d, x_view, y_view)
+        if shape_type == IMPORTED:
+            # 점이 너무 많으면 고리 구분 NaN은 남기고 일정 간격으로 골라 씀
+            path = join_rings(*shape)
+            stride = -(-len(path) * len(powers) // ORBIT_SAMPLE_BUDGET)
+            if stride > 1:
+                gaps = np.nonzero(np.isnan(path[:, 0]))[0]
+                path = path[np.union1d(np.arange(0, len(path), stride), gaps)]
+            return batch_transform(path, powers)
+        return batch_transform(shape, powers)
 
-    # ✅ Plotly 버전 시각화 함수
-    def plot_shape(shape_type, shape, transformed, matrix, font_family, a=1, b=1, c=0):
-        fig = go.Figure()
 
-        # 원래 도형
+# ✅ 그림 뼈대: trace 종류·스타일과 layout(축, 글꼴, 범례, 여백)을 도형 종류마다 한 번만 만들고 검증해 둠
+#    webgl: trace마다 Scattergl 여부 (변환전, 변환후, 궤도) / collapsed: 직선이 한 점으로 찌그러졌는지
+@lru_cache(maxsize=64)
+def figure_skeleton(shape_type, font_family, webgl, collapsed, with_orbit):
+    fig = go.Figure()
+    curve = shape_type in ("원", "직선", IMPORTED)
+    trace = lambda gl: go.Scattergl if gl else go.Scatter
+
+    # 원래 도형
+    fig.add_trace(trace(webgl[0])(
+        mode='lines' if curve else 'lines+markers',
+        name='변환전 도형',
+        line=dict(color='blue'),
+        marker=dict(color='blue')
+    ))
+
+    # 변환된 도형
+    fig.add_trace(trace(webgl[1])(
+        mode='lines' if curve and not collapsed else 'lines+markers',
+        name='변환후 도형',
+        line=dict(color='red', dash='dash'),
+        marker=dict(color='red')
+    ))
+
+    # 직선일 경우 변환된 점 하나 강조
+    if shape_type == "직선":
         fig.add_trace(go.Scatter(
-            x=shape[:, 0], y=shape[:, 1],
-            mode='lines+markers',
-            name='변환전 도형',
-            line=dict(color='blue'),
-            marker=dict(color='blue')
+            mode='markers',
+            name='변환된 점',
+            marker=dict(color='red', size=10, symbol='circle')
         ))
 
-        # 변환된 도형
-        fig.add_trace(go.Scatter(
-            x=transformed[:, 0], y=transformed[:, 1],
-            mode='lines+markers',
-            name='변환후 도형',
-            line=dict(color='red', dash='dash'),
-            marker=dict(color='red')
+    # 반복 적용 궤도
+    if with_orbit:
+        fig.add_trace(trace(webgl[2])(
+            mode='lines',
+            name='궤도 Aᵏ·S',
+            line=dict(color='purple', width=1),
+            opacity=0.5
         ))
 
-        # 직선일 경우 변환된 점 하나 강조
-        if shape_type == "직선":
-            if b != 0:
-                base_point = np.array([0, c / b])
-            else:
-                base_point = np.array([c / a, 0])
-            new_point = np.dot(base_point, matrix.T)
-            fig.add_trace(go.Scatter(
-                x=[new_point[0]], y=[new_point[1]],
-                mode='markers',
-                name='변환된 점',
-                marker=dict(color='red', size=10, symbol='circle')
-            ))
-
-        # 축 범위 조절
-        all_x = np.concatenate([shape[:, 0], transformed[:, 0]])
-        all_y = np.concatenate([shape[:, 1], transformed[:, 1]])
-        if shape_type == "직선":
-            all_x = np.append(all_x, new_point[0])
-            all_y = np.append(all_y, new_point[1])
-        x_center = np.mean(all_x)
-        y_center = np.mean(all_y)
-        x_range = np.ptp(all_x)
-        y_range = np.ptp(all_y)
-        half_range = max(x_range, y_range) * 0.75
-        half_range = min(half_range, 20)  # 최대 20으로 제한
-        if half_range < 1:
-            half_range = 2
-        fig.update_layout(
-            width=600,
-            height=600,
-            xaxis=dict(
-                range=[x_center - half_range, x_center + half_range],
-                zeroline=True,
-                zerolinecolor='gray',
-                showgrid=True,  # ✅ 보조선 추가
-                gridcolor='lightgray',  # ✅ 선 색상 설정 (선택)
-            ),
-            yaxis=dict(
-                range=[y_center - half_range, y_center + half_range],
-                zeroline=True,
-                zerolinecolor='gray',
-                scaleanchor='x'   # ✅ 이 위치가 맞습니다!
-            ),
-            font=dict(family=font_family),
-            legend=dict(x=0.01, y=0.99),
-            margin=dict(l=0, r=0, t=10, b=0)
-        )
-        return fig
+    fig.update_layout(
+        width=FIGURE_SIZE,
+        height=FIGURE_SIZE,
+        xaxis=dict(
+            zeroline=True,
+            zerolinecolor='gray',
+            showgrid=True,  # ✅ 보조선 추가
+            gridcolor='lightgray',  # ✅ 선 색상 설정 (선택)
+        ),
+        yaxis=dict(
+            zeroline=True,
+            zerolinecolor='gray',
+            scaleanchor='x'   # ✅ 이 위치가 맞습니다!
+        ),
+        font=dict(family=font_family),
+        legend=dict(x=0.01, y=0.99),
+        margin=dict(l=0, r=0, t=10, b=0)
+    )
+    return fig.to_dict()
 
 
+# ✅ 뼈대에 숫자 배열과 축 범위만 끼워 넣기 (뼈대 dict는 얕게 복사해서 캐시는 그대로 둠)
+#    뼈대가 이미 검증됐으므로 _validate=False로 Plotly의 속성 검사를 건너뜀
+def fill_skeleton(skeleton, points, x_view, y_view):
+    data = [dict(trace, x=xy[:, 0], y=xy[:, 1]) for trace, xy in zip(skeleton['data'], points)]
+    layout = dict(skeleton['layout'],
+                  xaxis=dict(skeleton['layout']['xaxis'], range=list(x_view)),
+                  yaxis=dict(skeleton['layout']['yaxis'], range=list(y_view)))
+    return go.Figure(dict(data=data, layout=layout), _validate=False)
 
-    ##################### (1) ########################
-    # ✅ 메뉴별 콘텐츠
 
+# ✅ Plotly 버전 시각화 함수
+#    원은 (중심, 모양 행렬), 직선은 계수 (a, b, c)와 그 상(transform_line 결과)으로 받고,
+#    화면 범위를 정한 뒤에야 점으로 바꾼다
+def plot_shape(shape_type, shape, transformed, matrix, font_family, orbit_powers=None):
+    # 직선일 경우 변환된 점 하나 강조
+    marked_points = ()
+    if shape_type == "직선":
+        base_point = line_base_point(*shape)
+        new_point = transform_shape(base_point, matrix)
+        marked_points = (base_point, new_point)
+
+    # 축 범위 조절
+    x_view, y_view = view_range(shape_type, shape, transformed, marked_points)
+
+    n_samples = None
+    if shape_type == "원":
+        n_samples = conic_sample_count(np.stack([shape[1], transformed[1]]), x_view, FIGURE_SIZE)
+    before = draw_points(shape_type, ('line', shape) if shape_type == "직선" else shape, x_view, y_view, n_samples)
+    after = draw_points(shape_type, transformed, x_view, y_view, n_samples)
+    points = [before, after]
+    if shape_type == "직선":
+        points.append(new_point[None, :])
+
+    # 반복 적용 궤도 (K개 복사본을 NaN으로 끊은 trace 하나, 화면 밖은 잘라내고 화면 해상도로 솎아냄)
+    path = np.empty(0, dtype=np.complex128)
+    if orbit_powers is not None:
+        stacked = orbit_points(shape_type, shape, orbit_powers, x_view, y_view)
+        path = join_with_gaps(stacked).view(np.complex128).ravel()     # (x, y) 쌍 → x + iy (복사 없이)
+        path, _ = clip_polyline(path, x_view, y_view)
+        path, _ = decimate_polyline(path, x_view, y_view, FIGURE_SIZE, FIGURE_SIZE)
+        points.append(np.column_stack([path.real, path.imag]))
 
+    webgl = tuple(scatter_class(n) is go.Scattergl for n in (len(before), len(after), path.size))
+    collapsed = shape_type == "직선" and transformed[0] == 'point'
+    skeleton = figure_skeleton(shape_type, font_family, webgl, collapsed, orbit_powers is not None)
+    return fill_skeleton(skeleton, points, x_view, y_view)
+
+
+# ✅ 브라우저 계산 모드: {trace 번호: 행렬을 곱할 점}
+#    변환후 도형 = 행렬 · 변환전 도형의 점, 직선은 화면 밖까지 길게, 강조점은 원래 점
+def client_sources(shape_type, shape, fig):
+    before = np.column_stack([fig.data[0].x, fig.data[0].y])
+    if shape_type != "직선":
+        return {1: before}
+    (x0, x1), (y0, y1) = fig.layout.xaxis.range, fig.layout.yaxis.range
+    reach = CLIENT_LINE_REACH * max(x1 - x0, y1 - y0)
+    far = clip_line(*line_parametric(*shape), (x0 - reach, x1 + reach), (y0 - reach, y1 + reach))
+    return {1: far, 2: line_base_point(*shape)[None, :]}
+
+
+# ✅ 브라우저에서 확정한 행렬을 a11…a22 입력칸에 반영 (컴포넌트 on_change 콜백)
+def sync_matrix_from_browser():
+    value = st.session_state.get("matrix_component")
+    if value:
+        for name, (i, j) in MATRIX_ENTRIES.items():
+            st.session_state[name] = float(value[i][j])
+
+
+# ✅ 입력과 출력 패널 전체를 fragment로: 위젯을 바꾸면 이 함수만 다시 실행됨
+#    (페이지 제목·사이드바·폰트 설정과 다른 섹션은 다시 실행하지 않음)
+@st.fragment
+def transformation_panel():
     col1, spacer, col2 = st.columns([1.4, 0.3, 2])  # 좌:입력 / 우:출력
 
     with col1:
         st.subheader("# 도형 입력 ___________________")
-        shape_type = st.selectbox("도형 종류를 선택하세요", ["삼각형", "사각형", "원", "직선"])
-
-        if shape_type == "삼각형":
-            A = np.array(st.text_input("점 A 좌표 (예: 1,1)", "1,1").split(','), dtype=float)
-            B = np.array(st.text_input("점 B 좌표 (예: 1,2)", "1,2").split(','), dtype=float)
-            C = np.array(st.text_input("점 C 좌표 (예: 2,1)", "2,1").split(','), dtype=float)
-            shape = np.array([A, B, C, A])
-        elif shape_type == "사각형":
-            A = np.array(st.text_input("점 A 좌표 (예: 1,1)", "1,1").split(','), dtype=float)
-            B = np.array(st.text_input("점 B 좌표 (예: 1,2)", "1,2").split(','), dtype=float)
-            C = np.array(st.text_input("점 C 좌표 (예: 2,2)", "2,2").split(','), dtype=float)
-            D = np.array(st.text_input("점 D 좌표 (예: 2,1)", "2,1").split(','), dtype=float)
-            shape = np.array([A, B, C, D, A])
-        elif shape_type == "원":
-            center = np.array(st.text_input("원 중심 좌표 (예: 1,1)", "1,1").split(','), dtype=float)
-            radius = st.number_input("반지름", value=2.0, step=0.1, format="%.1f")
-            theta = np.linspace(0, 2*np.pi, 200)
-            shape = np.stack([center[0] + radius * np.cos(theta),
-                                center[1] + radius * np.sin(theta)], axis=1)
-        elif shape_type == "직선":
-            st.markdown("직선의 형태: $ax + by = c$")
-            a = st.number_input("계수 a", value=1.0, step=0.1, format="%.1f")
-            b = st.number_input("계수 b", value=1.0, step=0.1, format="%.1f")
-            c = st.number_input("상수 c", value=2.0, step=0.1, format="%.1f")
-            x_vals = np.linspace(-20, 20, 400)
-            if b != 0:
-                y_vals = (c - a * x_vals) / b
-            else:
-                x_vals = np.full(400, c / a)
-                y_vals = np.linspace(-5, 5, 400)
-            shape = np.stack([x_vals, y_vals], axis=1)
+        shape_type = st.selectbox("도형 종류를 선택하세요", ["삼각형", "사각형", "원", "직선", IMPORTED])
+
+        # 좌표 문자열은 parse_point가 캐시해 두므로 다른 값을 바꿀 때 다시 해석하지 않음
+        try:
+            if shape_type == "삼각형":
+                A = np.array(parse_point(st.text_input("점 A 좌표 (예: 1,1)", "1,1")))
+                B = np.array(parse_point(st.text_input("점 B 좌표 (예: 1,2)", "1,2")))
+                C = np.array(parse_point(st.text_input("점 C 좌표 (예: 2,1)", "2,1")))
+                shape = np.array([A, B, C, A])
+            elif shape_type == "사각형":
+                A = np.array(parse_point(st.text_input("점 A 좌표 (예: 1,1)", "1,1")))
+                B = np.array(parse_point(st.text_input("점 B 좌표 (예: 1,2)", "1,2")))
+                C = np.array(parse_point(st.text_input("점 C 좌표 (예: 2,2)", "2,2")))
+                D = np.array(parse_point(st.text_input("점 D 좌표 (예: 2,1)", "2,1")))
+                shape = np.array([A, B, C, D, A])
+            elif shape_type == "원":
+                center = np.array(parse_point(st.text_input("원 중심 좌표 (예: 1,1)", "1,1")))
+                radius = st.number_input("반지름", value=2.0, step=0.1, format="%.1f")
+                shape = circle_conic(center, radius)      # 점 대신 (중심, 모양 행렬)
+            elif shape_type == "직선":
+                st.markdown("직선의 형태: $ax + by = c$")
+                a = st.number_input("계수 a", value=1.0, step=0.1, format="%.1f")
+                b = st.number_input("계수 b", value=1.0, step=0.1, format="%.1f")
+                c = st.number_input("상수 c", value=2.0, step=0.1, format="%.1f")
+                if a == 0 and b == 0:
+                    st.error("a와 b가 모두 0이면 직선이 아닙니다.")
+                    return
+                shape = (a, b, c)                         # 점 대신 계수
+            elif shape_type == IMPORTED:
+                uploaded = st.file_uploader("외곽선 파일 (CSV: 한 줄에 x,y · 빈 줄로 고리 구분 / GeoJSON / .npy)",
+                                            type=SUPPORTED_TYPES, key="polygon_file")
+                if uploaded is None:
+                    st.info("국경선, 글꼴 외곽선처럼 꼭짓점이 많은 도형 파일을 올려 보세요.")
+                    return
+                try:
+                    shape = load_polygons(uploaded.getvalue(), uploaded.name)   # 같은 파일이면 저장된 .npy를 메모리 맵으로
+                except (ValueError, KeyError, TypeError, OSError) as e:
+                    st.error(f"파일을 읽을 수 없습니다: {e}")
+                    return
+                st.caption(f"꼭짓점 {len(shape[0]):,}개 · 고리 {len(shape[1]) - 1:,}개")
+        except ValueError as e:
+            st.error(f"오류 : 좌표를 다시 확인해 주세요. ({e})")
+            return
 
         st.subheader("# 2×2 변환 행렬 입력 ___________________")
-        a11 = st.number_input("a11", value=1.0, step=0.5, format="%.1f")
-        a12 = st.number_input("a12", value=-1.0, step=0.5, format="%.1f")
-        a21 = st.number_input("a21", value=1.0, step=0.5, format="%.1f")
-        a22 = st.number_input("a22", value=2.0, step=0.5, format="%.1f")
+        a11 = st.number_input("a11", value=1.0, step=0.5, format="%.1f", key="a11")
+        a12 = st.number_input("a12", value=-1.0, step=0.5, format="%.1f", key="a12")
+        a21 = st.number_input("a21", value=1.0, step=0.5, format="%.1f", key="a21")
+        a22 = st.number_input("a22", value=2.0, step=0.5, format="%.1f", key="a22")
         matrix = np.array([[a11, a12], [a21, a22]])
 
+        # ✅ 브라우저 계산 모드: 슬라이더를 움직이는 동안은 Python을 거치지 않음
+        client_mode = st.checkbox("브라우저에서 바로 계산 (행렬 슬라이더)", key="client_matrix",
+                                  help="슬라이더를 움직이는 동안은 브라우저가 직접 그리고, 손을 떼면 위 입력칸에 반영됩니다.")
+
+        # ✅ 행렬을 반복 적용한 궤도
+        show_orbit = st.checkbox("반복 적용 궤도 보기 (A·S, A²·S, …, Aᴷ·S)", key="show_orbit")
+        if show_orbit:
+            orbit_steps = st.number_input("반복 횟수 K", min_value=1, max_value=5000, value=30, step=10,
+                                          key="orbit_steps")
+
     with col2:
-        # 직선 관련 계수 기본값 선언 (에러 방지용)
-        if shape_type == "직선":
-            a, b, c = a, b, c
+        #변환적용 (원은 타원으로, 직선은 역전치로 계수를 그대로 옮김)
+        if shape_type == "원":
+            transformed = transform_conic(*shape, matrix)
+        elif shape_type == "직선":
+            transformed = transform_line(a, b, c, matrix)
+        elif shape_type == IMPORTED:
+            transformed = (transform_shape(shape[0], matrix), shape[1])
         else:
-            a, b, c = 1, 1, 1
-
-        #변환적용
-        transformed = np.dot(shape, matrix.T)
+            transformed = transform_shape(shape, matrix)
 
         st.subheader("시각화 결과")
         st.subheader("수식 표시")
@@ -173,9 +329,34 @@ def run_transformation_by_matrix():
             st.latex(rf"(x - {format_number(center[0])})^2 + (y - {format_number(center[1])})^2 = {format_number(radius)}^2")
         elif shape_type == "직선":
             st.latex(rf"\text{{입력된 직선:}} \quad {format_number(a)}x + {format_number(b)}y = {format_number(c)}")
+            kind, image = transformed
+            if kind == 'line':
+                st.latex(rf"\text{{변환된 직선:}} \quad {image[0]:.3g}x + ({image[1]:.3g})y = {image[2]:.3g}")
+            else:
+                st.latex(rf"\text{{변환된 직선은 한 점으로:}} \quad ({image[0]:.3g}, {image[1]:.3g})")
+
+        # 거듭제곱을 한꺼번에 구해 K개의 변환 도형을 한 번에 계산
+        orbit_powers = matrix_powers(matrix, orbit_steps) if show_orbit else None
+
+        fig = plot_shape(shape_type, shape, transformed, matrix, plotly_font_family(), orbit_powers)
+        if client_mode:
+            matrix_transform(fig, client_sources(shape_type, shape, fig), matrix,
+                             hidden=[len(fig.data) - 1] if show_orbit else [],
+                             key="matrix_component", on_change=sync_matrix_from_browser)
+        else:
+            st.plotly_chart(fig, use_container_width=True)
+
+
+def run_transformation_by_matrix():
+    st.header("🟩 (1) 행렬을 통한 일차변환 시뮬레이터")
+    st.markdown("여러 도형을 여러 행렬로 일차변환하는 실험을 해 보세요.")
 
-        fig = plot_shape(shape_type, shape, transformed, matrix, 'NanumGothic', a, b, c)
-        st.plotly_chart(fig, use_container_width=True)
 
 
+    # ✅ 페이지 설정
+    #st.set_page_config(page_title="도형 변환 실험실", layout="wide")
+    #st.title("🔄 도형 변환 실험실")
 
+    ##################### (1) ########################
+    # ✅ 메뉴별 콘텐츠
+    transformation_panel()
@@ -1,7 +1,23 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objs as go
+import json
 from streamlit_plotly_events import plotly_events
+from transform_core import batch_transform, matrix_powers
+from figure_utils import decimate_points, scatter_class
+
+# ✅ 보기 방식
+MODE_POINT = "점 하나"
+MODE_ORBIT = "궤도 (R₂·R₁)ᵏ·P₀"
+MODE_GRID = "점 구름 (격자)"
+MODE_SHAPE = "도형 (F 모양)"
+
+VIEW_RANGE = (-5, 5)
+ORBIT_MAX = 5000
+ORBIT_BIN = 2                   # 궤도 점은 2픽셀 칸마다 하나만 그림
+GRID_POINTS = np.stack(np.meshgrid(np.linspace(-4, 4, 17), np.linspace(-4, 4, 17)), axis=-1).reshape(-1, 2)
+F_SHAPE = np.array([[0.5, 0.5], [0.5, 3], [2.5, 3], [2.5, 2.5], [1, 2.5], [1, 2], [2, 2],
+                    [2, 1.5], [1, 1.5], [1, 0.5], [0.5, 0.5]])     # 대칭이 없어 회전·뒤집힘이 잘 보이는 도형
 
 # ✅ 대칭 행렬 생성 함수 (축의 종류와 각도 입력 → 행렬)
 def reflection_matrix(axis_type, angle_deg=None):
@@ -17,17 +33,68 @@ def reflection_matrix(axis_type, angle_deg=None):
         norm = 1 + a**2
         return (1 / norm) * np.array([[1 - a**2, 2*a], [2*a, a**2 - 1]])
 
-# ✅ 시뮬레이터 실행 함수
-def run_symmetry_rotation():
-    st.header("(2) 두 번의 대칭이동 시뮬레이터")
-    st.caption("두 축 대칭의 결과가 회전과 같음을 시각적으로 관찰해 보세요.")
-
-
-
-    # 초기 점
-    if 'selected_point' not in st.session_state:
-        st.session_state.selected_point = np.array([2.0, 1.0])
-    x0, y0 = st.session_state.selected_point
+# ✅ 두 대칭의 합성 R₂·R₁ — 한 번만 계산해서 모든 점에 한꺼번에 곱함
+def composed_matrix(axis1, angle1, axis2, angle2):
+    return reflection_matrix(axis2, angle2) @ reflection_matrix(axis1, angle1)
+
+
+# ✅ 회전행렬의 회전각 (도)
+def rotation_angle(R):
+    return np.degrees(np.arctan2(R[1, 0], R[0, 0]))
+
+
+# ✅ 보기 방식별 점들 추가 (입력 → 1차 대칭 → 최종 결과 색 그대로)
+def add_batch_traces(fig, mode, R1, R, P0, orbit_steps):
+    if mode == MODE_ORBIT:
+        # P₀, R·P₀, R²·P₀, … 를 거듭제곱 묶음 한 번으로
+        orbit = batch_transform(P0, matrix_powers(R, orbit_steps))
+        pixels = 600 // ORBIT_BIN
+        index, _ = decimate_points(orbit[:, 0] + 1j * orbit[:, 1], VIEW_RANGE, VIEW_RANGE, pixels, pixels,
+                                   return_index=True)
+        fig.add_trace(scatter_class(index.size)(
+            x=orbit[index, 0], y=orbit[index, 1], mode='markers',
+            marker=dict(size=6, color=index + 1, colorscale='Viridis', showscale=True,
+                        colorbar=dict(title='k', thickness=10)),
+            name=f'(R₂·R₁)ᵏ·P₀ (k=1…{orbit_steps})'
+        ))
+    elif mode in (MODE_GRID, MODE_SHAPE):
+        points = GRID_POINTS if mode == MODE_GRID else F_SHAPE
+        trace_mode = 'markers' if mode == MODE_GRID else 'lines+markers'
+        fig.add_trace(go.Scatter(x=points[:, 0], y=points[:, 1], mode=trace_mode,
+                                 marker=dict(color='blue', size=5), line=dict(color='blue'),
+                                 opacity=0.5, name='처음 도형'))
+        if mode == MODE_SHAPE:
+            first = batch_transform(points, R1)
+            fig.add_trace(go.Scatter(x=first[:, 0], y=first[:, 1], mode=trace_mode,
+                                     marker=dict(color='green', size=5), line=dict(color='green'),
+                                     opacity=0.5, name='1차 대칭 R₁'))
+        moved = batch_transform(points, R)
+        fig.add_trace(go.Scatter(x=moved[:, 0], y=moved[:, 1], mode=trace_mode,
+                                 marker=dict(color='red', size=5), line=dict(color='red'),
+                                 opacity=0.7, name='R₂·R₁ 적용'))
+
+
+# ✅ 그래프 클릭 처리 — 위젯을 만들기 전에 실행해서 클릭 한 번에 화면을 한 번만 그림
+#    plotly_events 값은 key로 session_state에 남아 있으므로, 지난번에 처리한 클릭과 다를 때만
+#    x, y 입력칸(input_x, input_y)의 상태를 바꾼다 → 입력칸과 클릭한 점이 항상 같음
+def apply_click():
+    st.session_state.setdefault("input_x", 2.0)
+    st.session_state.setdefault("input_y", 1.0)
+    clicked = st.session_state.get("point_click")
+    if not clicked or clicked == st.session_state.get("point_click_seen"):
+        return
+    st.session_state.point_click_seen = clicked
+    points = json.loads(clicked)
+    if points:
+        st.session_state.input_x = float(points[0]['x'])
+        st.session_state.input_y = float(points[0]['y'])
+
+
+# ✅ 입력과 출력 패널 전체를 fragment로: 위젯을 바꾸거나 점을 클릭하면 이 함수만 다시 실행됨
+@st.fragment
+def symmetry_panel():
+    # 초기 점 (직전 클릭이 있으면 먼저 반영)
+    apply_click()
 
     col1, col2 = st.columns([1, 1.5])
 
@@ -37,8 +104,8 @@ def run_symmetry_rotation():
 
         # ✅ 초기 점 좌표 입력 (← 이 부분이 새로 추가될 영역입니다)
         st.markdown("🔵 **초기점 좌표를 입력하세요.(-5와 5사이)**")
-        x0 = st.number_input("x 좌표", value=2.0, step=0.3, format="%.2f", key="input_x")
-        y0 = st.number_input("y 좌표", value=1.0, step=0.3, format="%.2f", key="input_y")
+        x0 = st.number_input("x 좌표", step=0.3, format="%.2f", key="input_x")
+        y0 = st.number_input("y 좌표", step=0.3, format="%.2f", key="input_y")
         st.session_state.selected_point = np.array([x0, y0])
 
         axis1 = st.selectbox("첫 번째 대칭축", ["x축", "y축", "직선y=ax"], key="axis1")
@@ -55,6 +122,13 @@ def run_symmetry_rotation():
         else:
             angle2 = -45.0
 
+        # ✅ 합성 R₂·R₁을 점 구름·도형·궤도 전체에 한 번에 적용
+        mode = st.radio("보기 방식", [MODE_POINT, MODE_ORBIT, MODE_GRID, MODE_SHAPE], key="sym_mode")
+        orbit_steps = 0
+        if mode == MODE_ORBIT:
+            orbit_steps = st.number_input("반복 횟수 k", min_value=1, max_value=ORBIT_MAX, value=12, step=1,
+                                          key="sym_orbit_steps")
+
         st.markdown("🔵 입력점 | 🟢 1차 대칭 | 🔴 최종 대칭 결과")
         st.markdown("🟣 축1 (보라색 선), 🟠 축2 (주황색 선)")
 
@@ -67,6 +141,9 @@ def run_symmetry_rotation():
         P0 = np.array([x0, y0])
         P1 = R1 @ P0
         P2 = R2 @ P1
+        R = composed_matrix(axis1, angle1, axis2, angle2)
+        st.latex(rf"R_2 R_1 = \begin{{bmatrix}} {R[0, 0]:.3f} & {R[0, 1]:.3f} \\ {R[1, 0]:.3f} & {R[1, 1]:.3f} "
+                 rf"\end{{bmatrix}} \;=\; \text{{회전 }} {rotation_angle(R):.1f}^\circ")
 
         # 그래프 생성
         fig = go.Figure()
@@ -115,6 +192,8 @@ def run_symmetry_rotation():
                
 
 
+        add_batch_traces(fig, mode, R1, R, P0, orbit_steps)
+
         # 점 시각화
         fig.add_trace(go.Scatter(x=[P0[0]], y=[P0[1]], mode='markers',
                                  marker=dict(color='blue', size=10), name='입력점'))
@@ -141,9 +220,13 @@ def run_symmetry_rotation():
         ))
 
 
-        result = plotly_events(fig, click_event=True, override_height=600)
-        if result:
-            new_x = result[0]['x']
-            new_y = result[0]['y']
-            st.session_state.selected_point = np.array([new_x, new_y])
-            st.rerun()
+        # 클릭 결과는 다음 실행의 apply_click에서 처리 (st.rerun으로 두 번 그리지 않음)
+        plotly_events(fig, click_event=True, override_height=600, key="point_click")
+
+
+# ✅ 시뮬레이터 실행 함수
+def run_symmetry_rotation():
+    st.header("(2) 두 번의 대칭이동 시뮬레이터")
+    st.caption("두 축 대칭의 결과가 회전과 같음을 시각적으로 관찰해 보세요.")
+
+    symmetry_panel()
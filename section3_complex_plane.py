@@ -1,39 +1,275 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import os
 import plotly.graph_objects as go
+from locus_engine import (extract_contours, join_polylines, split_isolated, discover_range, evaluate_region,
+                          evaluate_region_pruned, LocusCache)
+from figure_utils import decimate_points, decimate_polyline, scatter_class
+from font_registry import plotly_font_family
+from expression_compiler import (compile_expression, ExpressionError,
+                                 LOCUS_VARIABLES, FUNCTION_VARIABLES)
 
 
-def run_complex_plane():
-    st.header("🟦 (3) 복소평면에서의 이동 시뮬레이터")
-    st.markdown("복소수 $z = x + iy$ 로 정의된 도형을 복소함수 $w = f(z)$ 를 통해 변환해 보세요.")
+# ✅ 자취 탐색 설정 (격자 해상도, 시도할 정의역 반지름 목록, 계산 정밀도)
+#    LOCUS_PRECISION = 'single' 이면 float32/complex64로 계산해 세션당 메모리를 절반으로 줄임
+LOCUS_RESOLUTION = 800
+LOCUS_RANGE_POLICY = tuple(range(8, 27, 2))
+LOCUS_PRECISION = 'double'
 
+# ✅ 보기 방식
+VIEW_RESULT = "변환 결과"
+VIEW_HOMOTOPY = "z → f(z) 애니메이션"
+VIEW_GRID = "격자 변환"
 
+# ✅ 격자 변환 설정 (선 하나당 점 수)
+GRID_SAMPLES = 200
 
+# ✅ 애니메이션 설정 (프레임 수, 프레임당 최대 점 수, 프레임 간격 ms)
+HOMOTOPY_FRAMES = 60
+HOMOTOPY_MAX_POINTS = 3000
+HOMOTOPY_FRAME_MS = 16
 
-    # ✅ 페이지 설정
-    #st.set_page_config(page_title="도형 변환 실험실", layout="wide")
-    #st.title("🔄 도형 변환 실험실")
+# ✅ 그래프 크기와 점 솎아내기 격자 (점 구름은 지름 4px 마커이므로 2px 칸마다 한 점)
+FIGURE_SIZE = 600
+MARKER_BIN = 2
 
-    # ✅ 한글 폰트 설정
-    font_path = './fonts/나눔 글꼴/나눔고딕/NanumFontSetup_TTF_GOTHIC/NanumGothic.ttf'
-    font_prop = None
-    if os.path.exists(font_path):
-        font_prop = fm.FontProperties(fname=font_path)
-        plt.rcParams['font.family'] = font_prop.get_name()
-        plt.rcParams['axes.unicode_minus'] = False
 
-    # ✅ 숫자 포맷 함수
-    def format_number(n):
-        return f"{n:.1f}".rstrip('0').rstrip('.') if n % 1 != 0 else str(int(n))
+# ✅ 축, 그리드, 스케일 동기화 (두 보기 방식 공통)
+def _style_axes(fig, x_range, y_range):
+    fig.update_xaxes(
+        range=x_range,
+        zeroline=True, zerolinecolor='gray',
+        showgrid=True, gridcolor='lightgray',
+        scaleanchor='y', scaleratio=1
+    )
+    fig.update_yaxes(
+        range=y_range,
+        zeroline=True, zerolinecolor='gray',
+        showgrid=True, gridcolor='lightgray',
+        scaleanchor='x', scaleratio=1
+    )
+    fig.update_layout(
+        title='복소함수를 통한 도형 변환',
+        xaxis_title='Re', yaxis_title='Im',
+        width=FIGURE_SIZE, height=FIGURE_SIZE, showlegend=True,
+        font=dict(family=plotly_font_family())
+    )
 
-    ################## (3) #####################
 
-    #st.subheader("🔷 복소평면에서의 변환")
-    #st.write("복소수를 이용한 여러 변환을 실험할 수 있습니다.")
+# ✅ (1-t)·z + t·f(z) 의 모든 프레임을 한 번의 NumPy 연산으로 계산 → (프레임 수, 점 수) 배열
+def homotopy_frames(Z, W, frames=HOMOTOPY_FRAMES):
+    t = np.linspace(0, 1, frames)[:, None]
+    return (1 - t) * Z[None, :] + t * W[None, :]
+
+
+# ✅ z가 f(z)로 변하는 애니메이션 그래프
+#    프레임을 미리 계산해 Plotly frames로 한 번에 보내므로 재생·구간 이동·반복은 브라우저에서 처리
+def homotopy_figure(Z, W, x_range, y_range, is_equation):
+    # z와 f(z)를 짝지은 채 화면 해상도로 솎고, 너무 많으면 일정 간격으로 고름 (선의 끊김 NaN은 유지)
+    if is_equation:
+        index, _ = decimate_polyline(Z, x_range, y_range, FIGURE_SIZE, FIGURE_SIZE, return_index=True)
+    else:
+        bins = FIGURE_SIZE // MARKER_BIN
+        index, _ = decimate_points(Z, x_range, y_range, bins, bins, return_index=True)
+    if index.size > HOMOTOPY_MAX_POINTS:
+        keep = np.zeros(index.size, dtype=bool)
+        keep[::int(np.ceil(index.size / HOMOTOPY_MAX_POINTS))] = True
+        keep |= ~np.isfinite(Z[index])
+        index = index[keep]
+    Z_part = Z[index].astype(np.complex64)
+    W_part = W[index].astype(np.complex64)
+    H = homotopy_frames(Z_part, W_part)
+
+    mode = 'lines' if is_equation else 'markers'
+    names = [str(k) for k in range(len(H))]
+    fig = go.Figure(
+        data=[
+            go.Scatter(x=Z_part.real, y=Z_part.imag, mode=mode, opacity=0.3,
+                       marker=dict(size=4, color='blue'), line=dict(color='blue', width=2),
+                       name='변환 전 도형 z'),
+            go.Scatter(x=W_part.real, y=W_part.imag, mode=mode, opacity=0.3,
+                       marker=dict(size=4, color='red'), line=dict(color='red', width=2),
+                       name='변환 후 도형 w'),
+            go.Scatter(x=H[0].real, y=H[0].imag, mode=mode,
+                       marker=dict(size=4, color='purple'), line=dict(color='purple', width=2),
+                       name='(1-t)·z + t·f(z)'),
+        ],
+        frames=[go.Frame(data=[go.Scatter(x=h.real, y=h.imag)], traces=[2], name=name)
+                for name, h in zip(names, H)],
+    )
+    _style_axes(fig, x_range, y_range)
+
+    play = dict(frame=dict(duration=HOMOTOPY_FRAME_MS, redraw=False),
+                transition=dict(duration=0), fromcurrent=True)
+    fig.update_layout(
+        updatemenus=[dict(
+            type='buttons', direction='left', x=0, y=-0.08, xanchor='left', yanchor='top',
+            buttons=[
+                dict(label='▶ 재생', method='animate', args=[None, play]),
+                dict(label='⏸ 정지', method='animate',
+                     args=[[None], dict(frame=dict(duration=0, redraw=False), mode='immediate')]),
+                dict(label='🔁 반복', method='animate',
+                     args=[(names + names[::-1]) * 5, dict(play, fromcurrent=False)]),
+            ],
+        )],
+        sliders=[dict(
+            x=0.3, y=-0.08, len=0.7, yanchor='top',
+            currentvalue=dict(prefix='t = '),
+            steps=[dict(method='animate', label=f"{t:.2f}",
+                        args=[[name], dict(mode='immediate', frame=dict(duration=0, redraw=False),
+                                           transition=dict(duration=0))])
+                   for name, t in zip(names, np.linspace(0, 1, len(names)))],
+        )],
+        margin=dict(b=120),
+    )
+    return fig
+
+
+# ✅ 자취를 감싸는 범위의 가로선·세로선을 한 번에 f(z)로 보냄
+#    반환: (가로선 z, 세로선 z, 가로선 w, 세로선 w), 각각 NaN으로 끊긴 1차원 복소 배열
+def warp_grid(fz, x_range, y_range, lines, samples=GRID_SAMPLES):
+    xs = np.linspace(*x_range, samples)
+    ys = np.linspace(*y_range, samples)
+    x_levels = np.linspace(*x_range, lines)
+    y_levels = np.linspace(*y_range, lines)
+    gap = np.full((lines, 1), np.nan + 1j * np.nan)
+
+    horizontal = np.hstack([xs[None, :] + 1j * y_levels[:, None], gap]).ravel()
+    vertical = np.hstack([x_levels[:, None] + 1j * ys[None, :], gap]).ravel()
+    Z = np.concatenate([horizontal, vertical])
+    W = np.broadcast_to(np.asarray(fz(z=Z), dtype=complex), Z.shape)
+    return horizontal, vertical, W[:horizontal.size], W[horizontal.size:]
+
+
+# ✅ 격자 변환 그래프: 선 밀도와 상관없이 trace 4개 (변환 전/후 × 가로/세로)
+def grid_warp_figure(fz, Z, lines):
+    finite = Z[np.isfinite(Z)]
+    center = complex(finite.real.mean(), finite.imag.mean())
+    half = max(np.ptp(finite.real), np.ptp(finite.imag), 1.0) * 0.55
+    x_range = (center.real - half, center.real + half)
+    y_range = (center.imag - half, center.imag + half)
+    horizontal, vertical, W_h, W_v = warp_grid(fz, x_range, y_range, lines)
+
+    # 극 근처의 아주 큰 값에 화면이 끌려가지 않도록 1~99% 범위로 축을 잡음
+    all_points = np.concatenate([horizontal, vertical, W_h, W_v])
+    all_points = all_points[np.isfinite(all_points)]
+    x_lo, x_hi = np.percentile(all_points.real, [1, 99])
+    y_lo, y_hi = np.percentile(all_points.imag, [1, 99])
+    margin = max(x_hi - x_lo, y_hi - y_lo) * 0.1
+    view_x = [x_lo - margin, x_hi + margin]
+    view_y = [y_lo - margin, y_hi + margin]
+
+    fig = go.Figure()
+    for points, color, width, name in [
+        (horizontal, 'lightblue', 1, 'z 격자 (가로선)'),
+        (vertical, 'lightsteelblue', 1, 'z 격자 (세로선)'),
+        (W_h, 'red', 1.5, 'w = f(z) (가로선의 상)'),
+        (W_v, 'darkorange', 1.5, 'w = f(z) (세로선의 상)'),
+    ]:
+        points, _ = decimate_polyline(points, view_x, view_y, FIGURE_SIZE, FIGURE_SIZE)
+        fig.add_trace(scatter_class(points.size)(
+            x=points.real, y=points.imag, mode='lines',
+            line=dict(color=color, width=width), name=name
+        ))
+    _style_axes(fig, view_x, view_y)
+    return fig
+
+
+# ✅ 프로세스 전체에서 공유하는 자취 캐시 (상한 64MB)
+LOCUS_CACHE_BYTES = 64 * 1024 * 1024
+locus_cache = LocusCache(LOCUS_CACHE_BYTES)
+
+
+# ✅ 자취 한 개를 그래프에 추가 → (표시한 점 수만큼의 배열, 생략한 점 수)
+#    화면 픽셀 단위로 점 솎아내기 (선은 선대로, 점은 2px 칸마다 하나)
+#    등식이라도 선으로 이어지지 않는 외딴 점(예: x**2 + y**2 == 0)은 선으로 그리면 보이지 않으므로 마커로
+def add_locus_traces(fig, points, is_equation, x_range, y_range, color, name):
+    if is_equation:
+        lines, isolated = split_isolated(points)
+        parts = [(part, mode) for part, mode in [(lines, 'lines'), (isolated, 'markers')] if np.isfinite(part).any()]
+    else:
+        parts = [(points, 'markers')]
+    shown, dropped = [np.empty(0, dtype=complex)], 0
+    for k, (part, trace_mode) in enumerate(parts):
+        if trace_mode == 'lines':
+            part, n = decimate_polyline(part, x_range, y_range, FIGURE_SIZE, FIGURE_SIZE)
+        else:
+            part, n = decimate_points(part, x_range, y_range, FIGURE_SIZE // MARKER_BIN, FIGURE_SIZE // MARKER_BIN)
+        shown.append(part)
+        dropped += n
+        fig.add_trace(scatter_class(part.size)(
+            x=part.real, y=part.imag,
+            mode=trace_mode, marker=dict(size=6 if is_equation else 4, color=color),
+            line=dict(color=color, width=2),
+            name=name, legendgroup=name, showlegend=k == 0
+        ))
+    return np.concatenate(shown), dropped
+
+
+# ✅ 자취 찾기 → (Z_selected, final_range), 없으면 (None, None)
+#    f(z)만 바뀐 재실행은 캐시 적중으로 격자 계산을 건너뜀
+def find_locus(locus, resolution=LOCUS_RESOLUTION, range_policy=LOCUS_RANGE_POLICY,
+               precision=LOCUS_PRECISION):
+    key = (locus.text, resolution, range_policy, precision)
+    cached = locus_cache.get(key)
+    if cached is not None:
+        return cached
+    result = _search_locus(locus, resolution, range_policy, precision)
+    if result[0] is not None:
+        locus_cache.put(key, result)
+    return result
+
 
+# ✅ f(z) 적용 결과도 같은 캐시에 → 보기 방식이나 격자선 개수만 바꾼 재실행은 f(z)를 다시 계산하지 않음
+def apply_function(fz, locus, Z_selected, resolution=LOCUS_RESOLUTION, range_policy=LOCUS_RANGE_POLICY,
+                   precision=LOCUS_PRECISION):
+    key = ('w', fz.text, locus.text, resolution, range_policy, precision)
+    cached = locus_cache.get(key)
+    if cached is not None:
+        return cached[0]
+    W = np.broadcast_to(np.asarray(fz(z=Z_selected), dtype=complex), Z_selected.shape)
+    locus_cache.put(key, (W,))
+    return W
+
+
+# ✅ 거친 탐색으로 정의역을 한 번에 정한 뒤 그 범위만 전체 해상도로 계산 (격자 계산 최대 2회)
+#    계산 중 오류는 다시 시도하지 않고 바로 올려 보냄
+def _search_locus(locus, N, range_policy, precision):
+    is_equation = locus.kind == 'equation'
+
+    def func(X, Y):
+        return locus(x=X, y=Y)
+
+    range_size = discover_range(func, range_policy, is_equation)
+    if range_size is None:
+        # 거친 격자보다 가는 자취일 수 있으므로 가장 넓은 창에서 한 번만 확인
+        range_size = max(range_policy)
+
+    # 등식이면 곡선 추출 엔진(거친 격자 + 부호 변화 칸만 세분)으로 순서 있는 폴리라인을 찾음
+    if is_equation:
+        polylines = extract_contours(func, (-range_size, range_size), (-range_size, range_size),
+                                     resolution=N, precision=precision)
+        if polylines:
+            return join_polylines(polylines), range_size
+    else:
+        # 부등식 영역은 블록 단위로 계산해 조건을 만족하는 점만 보관
+        #   구간 연산이 가능한 식은 블록 전체를 참/거짓으로 판정하고 경계 블록만 점별 계산
+        window = ((-range_size, range_size), (-range_size, range_size))
+        if locus.supports_intervals:
+            def classify(x_lo, x_hi, y_lo, y_hi):
+                return locus.classify(x=(x_lo, x_hi), y=(y_lo, y_hi))
+
+            Z = evaluate_region_pruned(func, classify, *window, N, precision=precision)
+        else:
+            Z = evaluate_region(func, *window, N, precision=precision)
+        if Z.size > 0:
+            return Z, range_size
+    return None, None
+
+
+# ✅ 입력과 출력 패널 전체를 fragment로: 위젯을 바꾸면 이 함수만 다시 실행됨
+#    자취(find_locus)와 f(z) 결과(apply_function)는 캐시되므로 보기 방식만 바꾸면 그림만 다시 그림
+@st.fragment
+def complex_plane_panel():
     col1, col2 = st.columns([1, 1])
 
     with col1:
@@ -47,49 +283,36 @@ def run_complex_plane():
 
         # ✅ 복소함수 입력
         st.subheader("# 복소함수식 입력 : w = f(z) ___________________")
-        st.markdown('<span style="color: purple;">⚠️ 허수 i는 1j로 표기하세요.(파이썬 표기법)</span>', unsafe_allow_html=True)
+        st.markdown('<span style="color: purple;">⚠️ 허수 i는 1j 또는 i로 표기하세요.(파이썬 표기법)</span>', unsafe_allow_html=True)
         fz_input = st.text_input("w =", value="(z - 1j)**2", key="function_input")
 
-    # ✅ 자동 정의역 추정 및 마스킹
-    Z_selected = None
-    final_range = None
-    max_attempts = 10
-    # 원본 정의식 보존
-    original = definition
-    for attempt in range(max_attempts):
-        range_size = 8 + attempt * 2
-        N = 800
-        x = np.linspace(-range_size, range_size, N)
-        y = np.linspace(-range_size, range_size, N)
-        X, Y = np.meshgrid(x, y)
-        Z = X + 1j * Y
-
-        eps = (2 * range_size) / (N - 1)
-        eps *= 2  # 허용오차 배율 조정 (라인도 두께 보장)
-        try:
-            local_vars = {"x": X, "y": Y, "np": np, "i": 1j}
-            # 등식 비교일 때 동적 eps 사용
-            if "==" in original:
-                left, right = original.split("==")
-                L = eval(left, local_vars)
-                R = eval(right, local_vars)
-                mask = np.abs(L - R) < eps
-            else:
-                mask = eval(original, local_vars)
-            mask = np.array(mask, dtype=bool)
-            if mask.sum() > 0:
-                Z_selected = Z[mask]
-                final_range = range_size
-                break
-        except Exception:
-            continue
+        # ✅ 보기 방식 (애니메이션은 모든 프레임을 한 번에 보내 브라우저에서 재생)
+        view_mode = st.radio("보기 방식", [VIEW_RESULT, VIEW_HOMOTOPY, VIEW_GRID], horizontal=True, key="view_mode")
+        if view_mode == VIEW_GRID:
+            grid_lines = st.slider("방향별 격자선 개수", min_value=5, max_value=60, value=21, key="grid_lines")
+
+    # ✅ 식 컴파일 (허용된 연산과 np 함수만, 결과는 캐시되어 재실행 시 다시 해석하지 않음)
+    try:
+        locus = compile_expression(definition, LOCUS_VARIABLES)
+    except ExpressionError as e:
+        st.error(f"오류 : 식을 다시 확인해 주세요. ({e})")
+        return
+    is_equation = locus.kind == 'equation'
+
+    # ✅ 자동 정의역 추정 및 마스킹 (같은 자취는 캐시에서 바로 가져옴)
+    try:
+        Z_selected, final_range = find_locus(locus)
+    except Exception as e:
+        st.error(f"오류 : 식을 다시 확인해 주세요. ({e})")
+        return
 
     if Z_selected is None or Z_selected.size == 0:
         st.error("오류 : 식을 다시 확인해 주세요.")
     else:
         # ✅ 복소함수 적용
         try:
-            W = eval(fz_input, {"z": Z_selected, "np": np})
+            fz = compile_expression(fz_input, FUNCTION_VARIABLES)
+            W = apply_function(fz, locus, Z_selected)
         except Exception as e:
             st.error(f"복소함수 적용 오류: {e}")
             W = None
@@ -97,47 +320,52 @@ def run_complex_plane():
         # ✅ 시각화
         with col2:
             if W is not None and getattr(W, 'size', 0) > 0:
-                import plotly.graph_objects as go
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=Z_selected.real, y=Z_selected.imag,
-                    mode='markers', marker=dict(size=4, color='blue'),
-                    name='변환 전 도형 z'
-                ))
-                fig.add_trace(go.Scatter(
-                    x=W.real, y=W.imag,
-                    mode='markers', marker=dict(size=4, color='red'),
-                    name='변환 후 도형 w'
-                ))
-
-                # 축 및 그리드, 스케일 동기화
-                all_re = np.concatenate([Z_selected.real, W.real])
-                all_im = np.concatenate([Z_selected.imag, W.imag])
-                x_min, x_max = all_re.min(), all_re.max()
-                y_min, y_max = all_im.min(), all_im.max()
+                # 축 범위 (보이는 점 기준), 그리드, 스케일 동기화
+                all_points = np.concatenate([Z_selected, W])
+                all_points = all_points[np.isfinite(all_points)]
+                x_min, x_max = all_points.real.min(), all_points.real.max()
+                y_min, y_max = all_points.imag.min(), all_points.imag.max()
                 margin = max(x_max - x_min, y_max - y_min) * 0.1
-                fig.update_xaxes(
-                    range=[x_min - margin, x_max + margin],
-                    zeroline=True, zerolinecolor='gray',
-                    showgrid=True, gridcolor='lightgray',
-                    scaleanchor='y', scaleratio=1
-                )
-                fig.update_yaxes(
-                    range=[y_min - margin, y_max + margin],
-                    zeroline=True, zerolinecolor='gray',
-                    showgrid=True, gridcolor='lightgray',
-                    scaleanchor='x', scaleratio=1
-                )
-                fig.update_layout(
-                    title='복소함수를 통한 도형 변환',
-                    xaxis_title='Re', yaxis_title='Im',
-                    width=600, height=600, showlegend=True
-                )
+                x_range = [x_min - margin, x_max + margin]
+                y_range = [y_min - margin, y_max + margin]
+
+                if view_mode == VIEW_HOMOTOPY:
+                    fig = homotopy_figure(Z_selected, W, x_range, y_range, is_equation)
+                    st.plotly_chart(fig)
+                    return
+                if view_mode == VIEW_GRID:
+                    st.plotly_chart(grid_warp_figure(fz, Z_selected, grid_lines))
+                    return
+
+                # 등식은 순서 있는 곡선(선), 부등식은 영역(점)으로 표시, 점이 많으면 WebGL
+                fig = go.Figure()
+                Z_shown, z_dropped = add_locus_traces(fig, Z_selected, is_equation, x_range, y_range,
+                                                      'blue', '변환 전 도형 z')
+                W_shown, w_dropped = add_locus_traces(fig, W, is_equation, x_range, y_range,
+                                                      'red', '변환 후 도형 w')
+                _style_axes(fig, x_range, y_range)
                 st.plotly_chart(fig)
+                if z_dropped or w_dropped:
+                    st.caption(f"화면 해상도에 맞춰 겹치는 점을 생략했습니다: "
+                               f"z {Z_shown.size:,}개 표시 ({z_dropped:,}개 생략), "
+                               f"w {W_shown.size:,}개 표시 ({w_dropped:,}개 생략)")
             else:
                 st.warning("복소함수 적용 결과가 없습니다.")
 
 
+def run_complex_plane():
+    st.header("🟦 (3) 복소평면에서의 이동 시뮬레이터")
+    st.markdown("복소수 $z = x + iy$ 로 정의된 도형을 복소함수 $w = f(z)$ 를 통해 변환해 보세요.")
+
+
 
 
+    # ✅ 페이지 설정
+    #st.set_page_config(page_title="도형 변환 실험실", layout="wide")
+    #st.title("🔄 도형 변환 실험실")
 
+    ################## (3) #####################
+
+    #st.subheader("🔷 복소평면에서의 변환")
+    #st.write("복소수를 이용한 여러 변환을 실험할 수 있습니다.")
+    complex_plane_panel()
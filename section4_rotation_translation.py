@@ -3,10 +3,9 @@ import numpy as np
 import plotly.graph_objs as go
 
 
-def run_rotation_translation():
-    st.header("🟥 (4) 회전과 평행이동 시뮬레이터")
-    st.markdown("평행이동&회전이동&평행이동은 회전이동일까요? 회전의 기준점은?")
-
+# ✅ 입력과 출력 패널 전체를 fragment로: 위젯을 바꾸면 이 함수만 다시 실행됨
+@st.fragment
+def rotation_translation_panel():
     # ✅ 좌: 입력 / 우: 그래프
     left_col, right_col = st.columns([1, 1.5])
 
@@ -107,3 +106,10 @@ def run_rotation_translation():
         gcol1, gcol2, gcol3 = st.columns([0.5, 5, 0.5])
         with gcol2:
             st.plotly_chart(fig, use_container_width=False)
+
+
+def run_rotation_translation():
+    st.header("🟥 (4) 회전과 평행이동 시뮬레이터")
+    st.markdown("평행이동&회전이동&평행이동은 회전이동일까요? 회전의 기준점은?")
+
+    rotation_translation_panel()
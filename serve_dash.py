@@ -0,0 +1,55 @@
+import multiprocessing
+import os
+
+from gunicorn.app.base import BaseApplication
+
+from dash_symmetry_tool import server
+
+# ✅ dash_symmetry_tool 운영용 실행 (gunicorn 워커 여러 개, 디버그·자동 재시작 없음)
+#    시험 때처럼 많은 학생이 한꺼번에 접속할 때는 app.run 대신 이것으로 실행
+#
+#        python serve_dash.py
+#
+#    설정 (환경 변수)
+#        DASH_BIND            주소:포트 (기본 0.0.0.0:8050)
+#        DASH_WORKERS         워커 프로세스 수 (기본 CPU 수 × 2 + 1)
+#        DASH_THREADS         워커마다 스레드 수 (기본 4)
+#        DASH_TIMEOUT         요청 하나의 최대 시간, 초 (기본 30)
+#        SYMMETRY_CLIENTSIDE  1이면 슬라이더·점 끌기를 브라우저에서 계산 (기본), 0이면 서버에서
+
+BIND = os.environ.get("DASH_BIND", "0.0.0.0:8050")
+WORKERS = int(os.environ.get("DASH_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+THREADS = int(os.environ.get("DASH_THREADS", "4"))
+TIMEOUT = int(os.environ.get("DASH_TIMEOUT", "30"))
+
+
+# ✅ 이 파일 안에서 gunicorn을 바로 띄우기 위한 최소 설정 묶음
+class DashServer(BaseApplication):
+    def __init__(self, app, options):
+        self.application = app
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def main():
+    options = {
+        "bind": BIND,
+        "workers": WORKERS,
+        "threads": THREADS,
+        "worker_class": "gthread",
+        "timeout": TIMEOUT,
+        "preload_app": True,        # 레이아웃·첫 그림은 한 번만 만들고 워커가 fork로 나눠 씀
+        "accesslog": None,
+    }
+    DashServer(server, options).run()
+
+
+if __name__ == "__main__":
+    main()
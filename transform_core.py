@@ -0,0 +1,182 @@
+import numpy as np
+
+# ✅ 도형 일차변환 계산 모듈 (Streamlit 없이 사용 가능)
+#    여러 도형 × 여러 2×2 행렬을 한 번의 einsum으로 변환한다.
+#
+#    예) 문제 변형 수천 개 만들기
+#        vertices, offsets = pack_shapes([triangle, square, circle])
+#        out = batch_transform(vertices, matrices)        # (행렬 수, 전체 꼭짓점 수, 2)
+#        shape_k_under_m = out[m, offsets[k]:offsets[k + 1]]
+
+
+# ✅ 길이가 다른 도형들을 하나의 꼭짓점 배열 + 시작 위치(offsets)로 묶기
+#    도형 k의 꼭짓점 = vertices[offsets[k]:offsets[k + 1]]
+def pack_shapes(shapes, dtype=np.float64):
+    arrays = [np.asarray(s, dtype=dtype).reshape(-1, 2) for s in shapes]
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    np.cumsum([len(a) for a in arrays], out=offsets[1:])
+    vertices = np.concatenate(arrays) if arrays else np.empty((0, 2), dtype=dtype)
+    return vertices, offsets
+
+
+# ✅ 묶은 배열을 다시 도형 목록으로 (복사 없이 잘라낸 view)
+def unpack_shapes(vertices, offsets):
+    return [vertices[..., offsets[k]:offsets[k + 1], :] for k in range(len(offsets) - 1)]
+
+
+# ✅ 길이가 다른 도형들을 (도형 수, 최대 꼭짓점 수, 2) 배열로 채우기 (빈 칸은 fill)
+#    반환: (padded, lengths)
+def pad_shapes(shapes, fill=np.nan, dtype=np.float64):
+    arrays = [np.asarray(s, dtype=dtype).reshape(-1, 2) for s in shapes]
+    lengths = np.array([len(a) for a in arrays], dtype=np.int64)
+    padded = np.full((len(arrays), lengths.max(initial=0), 2), fill, dtype=dtype)
+    for k, a in enumerate(arrays):
+        padded[k, :len(a)] = a
+    return padded, lengths
+
+
+# ✅ 모든 (행렬, 꼭짓점) 쌍을 한 번에 변환
+#    matrices: (2, 2) 또는 (M, 2, 2) / vertices: (..., 2)  (묶은 배열이든 채운 배열이든 가능)
+#    반환: (M, ..., 2)  — 행렬이 하나면 (..., 2)
+def batch_transform(vertices, matrices):
+    vertices = np.asarray(vertices)
+    matrices = np.asarray(matrices, dtype=np.result_type(vertices.dtype, np.float32))
+    if matrices.ndim == 2:
+        return vertices @ matrices.T
+    return np.einsum('mij,...j->m...i', matrices, vertices, optimize=True)
+
+
+# ✅ 도형 하나 × 행렬 하나 (화면의 일차변환에서 사용)
+def transform_shape(shape, matrix):
+    return batch_transform(shape, matrix)
+
+
+# ✅ 고유벡터 행렬의 조건수가 이보다 크면 (결함 행렬·거의 평행한 고유벡터) 대각화 대신 제곱 반복 사용
+DIAGONALIZE_COND_LIMIT = 1e8
+
+
+# ✅ A¹, A², …, A^K 를 한꺼번에 계산 → (K, 2, 2)
+#    대각화 가능하면 A^k = V·diag(λ^k)·V⁻¹ 을 k 전체에 대해 한 번에,
+#    아니면 이미 구한 거듭제곱을 두 배씩 늘려 가며 묶음 곱셈 (곱셈 묶음 log₂K 번)
+def matrix_powers(matrix, K):
+    A = np.asarray(matrix, dtype=np.float64)
+    if K <= 0:
+        return np.empty((0, 2, 2))
+    eigvals, eigvecs = np.linalg.eig(A)
+    if np.isfinite(eigvecs).all() and np.linalg.cond(eigvecs) < DIAGONALIZE_COND_LIMIT:
+        k = np.arange(1, K + 1)
+        with np.errstate(over='ignore', invalid='ignore'):
+            scaled = eigvecs[None, :, :] * (eigvals[None, :] ** k[:, None])[:, None, :]
+            powers = scaled @ np.linalg.inv(eigvecs)
+        return powers.real if np.isrealobj(A) else powers
+
+    powers = np.empty((K, 2, 2))
+    powers[0] = A
+    n = 1
+    with np.errstate(over='ignore', invalid='ignore'):
+        while n < K:
+            m = min(n, K - n)
+            powers[n:n + m] = powers[:m] @ powers[n - 1]     # A^(j+1) · A^n = A^(n+j+1)
+            n += m
+    return powers
+
+
+# ✅ 도형의 궤도 A·S, A²·S, …, A^K·S → (K, 꼭짓점 수, 2)
+def orbit(shape, matrix, K):
+    with np.errstate(over='ignore', invalid='ignore'):
+        return batch_transform(shape, matrix_powers(matrix, K))
+
+
+# ✅ (K, N, 2) 묶음 → NaN 행으로 끊은 (K·(N+1), 2) 배열 (Plotly trace 하나로 그리기)
+def join_with_gaps(stacked):
+    stacked = np.asarray(stacked, dtype=np.float64)
+    gap = np.full(stacked.shape[:-2] + (1, 2), np.nan)
+    return np.concatenate([stacked, gap], axis=-2).reshape(-1, 2)
+
+
+# ✅ 원·타원은 점을 찍지 않고 그대로 들고 다닌다: {center + E·u : |u| = 1}
+#    E는 2×2 모양 행렬 (원이면 r·I). 행렬 M을 곱하면 center → M·center, E → M·E (특이행렬이면 선분으로 찌그러짐)
+def circle_conic(center, radius):
+    return np.asarray(center, dtype=np.float64), radius * np.eye(2)
+
+
+# ✅ matrix가 (K, 2, 2)여도 됨 → (K, 2), (K, 2, 2)
+def transform_conic(center, E, matrix):
+    M = np.asarray(matrix, dtype=np.float64)
+    return np.einsum('...ij,...j->...i', M, center), M @ E
+
+
+# ✅ 타원을 감싸는 상자: x 방향 반폭 = E의 첫 행 길이, y 방향 = 둘째 행 길이
+def conic_bounds(center, E):
+    half = np.linalg.norm(E, axis=-1)
+    return center - half, center + half
+
+
+# ✅ 화면에서 SAMPLE_PIXELS 픽셀마다 점 하나가 되도록 둘레에 맞춘 점 개수
+SAMPLE_PIXELS = 3
+MIN_SAMPLES, MAX_SAMPLES = 16, 2000
+
+
+def conic_sample_count(E, x_range, width):
+    s = np.linalg.svd(np.asarray(E, dtype=np.float64), compute_uv=False)
+    a, b = s[..., 0].max(), s[..., 1].max()
+    perimeter = np.pi * (3 * (a + b) - np.sqrt((3 * a + b) * (a + 3 * b)))   # 라마누잔 근사
+    pixels = perimeter * width / (x_range[1] - x_range[0])
+    return int(np.clip(np.ceil(pixels / SAMPLE_PIXELS), MIN_SAMPLES, MAX_SAMPLES))
+
+
+# ✅ 그릴 때만 점으로: (..., n, 2)  — 처음과 끝 점이 같아 닫힌 곡선
+def sample_conic(center, E, n):
+    theta = np.linspace(0, 2 * np.pi, n)
+    u = np.stack([np.cos(theta), np.sin(theta)], axis=1)
+    return np.asarray(center)[..., None, :] + np.einsum('...ij,nj->...ni', E, u)
+
+
+# ✅ 직선 ax + by = c → (원점에서 가장 가까운 점, 방향 벡터)
+def line_parametric(a, b, c):
+    n = np.array([a, b], dtype=np.float64)
+    nn = n @ n
+    if nn == 0:
+        raise ValueError("a와 b가 모두 0이면 직선이 아닙니다.")
+    return n * c / nn, np.array([-b, a], dtype=np.float64)
+
+
+# ✅ 행렬식이 이보다 작으면 (행렬 크기 기준) 특이행렬로 본다
+SINGULAR_TOL = 1e-12
+
+
+# ✅ 직선의 상을 계수로 바로 계산
+#    가역이면 점 p가 n·p = c 위에 있을 때 M·p는 (M⁻ᵀn)·(M·p) = c 위에 있음 (역전치)
+#    특이행렬이면 매개변수 표현 M·p₀ + t·M·d 로 계산 → 직선이거나 한 점으로 찌그러짐
+#    반환: ('line', (a', b', c')) 또는 ('point', 점)
+def transform_line(a, b, c, matrix):
+    M = np.asarray(matrix, dtype=np.float64)
+    scale = max(np.abs(M).max(), 1.0)
+    if abs(np.linalg.det(M)) > SINGULAR_TOL * scale ** 2:
+        na, nb = np.linalg.solve(M.T, [a, b])
+        return 'line', (na, nb, c)
+    p0, d = line_parametric(a, b, c)
+    p, v = M @ p0, M @ d
+    if np.abs(v).max() <= SINGULAR_TOL * scale * np.abs(d).max():
+        return 'point', p
+    return 'line', (-v[1], v[0], v[0] * p[1] - v[1] * p[0])
+
+
+# ✅ 무한 직선 p₀ + t·d 를 화면 사각형으로 잘라 양 끝점만 → (..., 2, 2)
+#    화면을 지나지 않거나 d = 0이면 NaN
+def clip_line(p0, d, x_range, y_range):
+    p0 = np.asarray(p0, dtype=np.float64)
+    d = np.asarray(d, dtype=np.float64)
+    lo = np.array([x_range[0], y_range[0]])
+    hi = np.array([x_range[1], y_range[1]])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (lo - p0) / d
+        t2 = (hi - p0) / d
+    moving = d != 0
+    inside = (p0 >= lo) & (p0 <= hi)
+    t_in = np.where(moving, np.minimum(t1, t2), np.where(inside, -np.inf, np.inf)).max(axis=-1)
+    t_out = np.where(moving, np.maximum(t1, t2), np.where(inside, np.inf, -np.inf)).min(axis=-1)
+    visible = moving.any(axis=-1) & (t_in <= t_out)
+    t = np.stack([t_in, t_out], axis=-1)
+    t = np.where(visible[..., None], t, np.nan)
+    return p0[..., None, :] + t[..., None] * d[..., None, :]